@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Collector memory benchmark
+==========================
+Peak traced memory (tracemalloc) of a full HNCollector.run for growing
+lookbacks, against a synthetic in-process Algolia — no network, no cache.
+
+With the classic json format every signal is held for the in-memory sort,
+so the peak grows with the lookback. The streaming formats (--no-sort)
+should stay flat: posts are paged in window by window and each signal is
+written out as soon as it is built.
+
+Usage:
+  python3 benchmarks/bench_memory.py
+  python3 benchmarks/bench_memory.py --days 30 365 --formats json jsonl
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hn_collector  # noqa: E402
+from hn_ratelimit import AdaptiveRateLimiter  # noqa: E402
+
+POST_INTERVAL = 1800     # one synthetic story every 30 minutes
+HIT_CAP = 1000           # like Algolia: no hits beyond the first 1000
+NUMERIC = re.compile(r'(\w+)(<=|>=|<|>|=)(\d+)')
+OPS = {'<': int.__lt__, '>': int.__gt__, '<=': int.__le__, '>=': int.__ge__, '=': int.__eq__}
+
+
+class _Response:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class SyntheticAlgolia:
+    """Deterministic stories derived from their timestamp; every response is
+    built fresh, like a decoded HTTP body, so the collector's memory is what
+    gets measured — not the fake's."""
+
+    def __init__(self, now, seed=7):
+        self.now = now
+        self.seed = seed
+        self.calls = 0
+
+    def _story(self, ts):
+        story_id = ts // POST_INTERVAL
+        rnd = random.Random(story_id * 1000003 + self.seed)
+        show = rnd.random() < 0.3
+        n = story_id
+        return {
+            'objectID': str(n),
+            'title': (f"Show HN: I built a tool for thing {n}" if show
+                      else f"Ask HN: How do you handle problem {n}?"),
+            'url': f"https://github.com/user{n % 97}/project{n}" if rnd.random() < 0.5 else '',
+            'author': f"user{n % 997}",
+            'points': rnd.randint(0, 400),
+            'num_comments': rnd.randint(0, 300),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(ts)),
+            'created_at_i': ts,
+            'story_text': ('<p>We built this over the weekend &amp; it is open source.'
+                           '<p>Pricing: free tier, docs at https://docs.example.com/x') * 3,
+            '_tags': ['story', f"author_user{n % 997}", f"story_{n}"] + (['show_hn'] if show else []),
+        }
+
+    def _comments(self, story_id, limit):
+        rnd = random.Random(int(story_id))
+        return [{
+            'objectID': f"{story_id}{k:03d}",
+            'story_id': int(story_id),
+            'author': f"commenter{rnd.randint(0, 5000)}",
+            'comment_text': (f"<p>Nice work. I tried something similar with "
+                             f"https://github.com/other/repo{k} and hit the same wall.") * 2,
+            'points': None,
+        } for k in range(min(limit, rnd.randint(0, 40)))]
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        params = params or {}
+        tags = params.get('tags', '')
+        per_page = int(params.get('hitsPerPage', 20))
+        page = int(params.get('page', 0))
+
+        if tags.startswith('comment'):
+            hits = []
+            for story_id in re.findall(r'story_(\d+)', tags):
+                hits.extend(self._comments(story_id, per_page))
+        else:
+            lo, hi, filters = 0, self.now, []
+            for name, op, value in NUMERIC.findall(params.get('numericFilters', '')):
+                value = int(value)
+                if name == 'created_at_i' and op == '>':
+                    lo = max(lo, value)
+                elif name == 'created_at_i' and op == '<=':
+                    hi = min(hi, value)
+                else:
+                    filters.append((name, OPS[op], value))
+            tag = tags.split(',')[0]
+            hits = []
+            ts = hi // POST_INTERVAL * POST_INTERVAL
+            while ts > lo:
+                story = self._story(ts)
+                if tag in story['_tags'] and all(op(story[k], v) for k, op, v in filters):
+                    hits.append(story)
+                ts -= POST_INTERVAL
+
+        total = len(hits)
+        visible = hits[:HIT_CAP]
+        return _Response({
+            'hits': visible[page * per_page:(page + 1) * per_page],
+            'nbHits': total,
+            'nbPages': -(-len(visible) // per_page),
+            'page': page,
+            'hitsPerPage': per_page,
+        })
+
+
+def measure(days, fmt, sort):
+    """(signals, peak_bytes, wall_seconds, api_calls) for one run."""
+    fake = SyntheticAlgolia(now=int(time.time()))
+    with tempfile.TemporaryDirectory() as out:
+        collector = hn_collector.HNCollector(lookback_days=days, output_dir=out,
+                                             use_cache=False, output_format=fmt)
+        collector.session.get = fake.get
+        collector.limiter = AdaptiveRateLimiter(rate=1e6, max_rate=1e6, burst=1e6,
+                                                hourly_budget=1e9)
+        tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            collector.run(sort=sort)
+        wall = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    signals = collector.stats['show_hn_collected'] + collector.stats['threads_collected']
+    return signals, peak, wall, fake.calls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak memory of HNCollector.run vs lookback.")
+    parser.add_argument('--days', type=int, nargs='+', default=[30, 90, 365])
+    parser.add_argument('--formats', nargs='+', default=['json', 'jsonl'],
+                        choices=sorted(hn_collector.OUTPUT_FORMATS))
+    parser.add_argument('--sort', action='store_true',
+                        help="sort streaming formats too (external merge pass)")
+    args = parser.parse_args(argv)
+
+    print(f"{'format':<8} {'days':>5} {'signals':>8} {'peak MB':>8} {'wall s':>7} {'calls':>7}")
+    for fmt in args.formats:
+        sort = args.sort or fmt == 'json'
+        for days in args.days:
+            signals, peak, wall, calls = measure(days, fmt, sort)
+            print(f"{fmt:<8} {days:>5} {signals:>8} {peak / 1e6:>8.1f} {wall:>7.1f} {calls:>7}",
+                  flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Intent pattern benchmark
+========================
+Checks HNCollector.classify_intent / detect_monetisation (one combined
+PatternScanner pass) against the previous per-pattern re.search versions,
+kept below as the reference, then times both.
+
+The corpus is every title, body and comment in the recorded snapshots,
+each also paired with its post title the way build_signal scans them,
+plus hand-written overlap cases and seeded phrase soup. Every input must
+give the same intent and the same monetisation hits in the same order;
+the script exits non-zero otherwise.
+
+Usage:
+  python3 benchmarks/bench_patterns.py
+  python3 benchmarks/bench_patterns.py --snapshots hn_signals/raw/hn_signals_2*.json --repeat 5
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hn_collector import (BUILDER_PATTERNS, EXPERIMENTER_PATTERNS,  # noqa: E402
+                          MONETISE_PATTERNS, HNCollector, load_snapshot)
+
+EDGE_CASES = [
+    ('', ''), ('Show HN', None), (None, 'plain text'),
+    ("We're experimenting with a prototype", ''),
+    ('Show HN: I built a self-hosted SaaS', 'pricing, waitlist and sign up'),
+    ('weekend project', 'hacking on a poc; early-stage alpha / beta wip'),
+    ("I'm building", "we've been working on it; ive been working on it"),
+    ('open source', 'open-sourced opensource open_source'),
+    ('on-prem onprem on prem', 'self-host selfhosted self hosted'),
+    ('arrr arr marr', 'MRR ARR Revenue'), ('i built i made', 'i created'),
+    ('introducing\nannouncing', 'just shipped\tjust released'),
+    ('check out my check out our', 'here is my here is our'),
+]
+
+# Pattern fragments, near misses and separators shuffled together
+FUZZ_TOKENS = [
+    'i built', 'we made', 'launching', 'just launched', "we're building", 'im building',
+    'side project', 'open source', 'opensourced', 'experimenting with', 'playing with',
+    'prototype', 'proof of concept', 'poc', 'tinkering', 'alpha', 'beta', 'wip',
+    'pricing', 'saas', 'mrr', 'arr', 'revenue', 'self-hosted', 'selfhost', 'on-prem',
+    'sign up', 'waitlist', 'enterprise', 'builtin', 'alphabet', 'betas', 'arrow',
+    'i', 'we', "'", '-', '.', ',', ' ', '  ', '\n', 'x', 'building', 'working',
+]
+
+
+def fuzz_inputs(n, seed=6):
+    rnd = random.Random(seed)
+    return [(''.join(rnd.choice(FUZZ_TOKENS) for _ in range(rnd.randint(1, 8))),
+             ''.join(rnd.choice(FUZZ_TOKENS) for _ in range(rnd.randint(0, 40))))
+            for _ in range(n)]
+
+
+def classify_intent_reference(title, text):
+    """classify_intent before PatternScanner (one re.search per pattern)."""
+    combined = f"{title or ''} {text or ''}".lower()
+    b = sum(1 for p in BUILDER_PATTERNS if re.search(p, combined))
+    e = sum(1 for p in EXPERIMENTER_PATTERNS if re.search(p, combined))
+    if b >= 2 or (b == 1 and e == 0):
+        return 'builder'
+    if e >= 1:
+        return 'experimenter'
+    return 'discussion'
+
+
+def detect_monetisation_reference(title, text):
+    combined = f"{title or ''} {text or ''}".lower()
+    hits = [p for p in MONETISE_PATTERNS if re.search(p, combined)]
+    return len(hits) > 0, hits
+
+
+def load_corpus(paths):
+    """(title, text) pairs: each post, each comment alone and with its post title."""
+    pairs, seen = [], set()
+    for path in paths:
+        for sig in load_snapshot(path)['signals']:
+            if sig['hn_id'] in seen:
+                continue
+            seen.add(sig['hn_id'])
+            pairs.append((sig['title'], sig.get('body_text') or ''))
+            for c in sig.get('top_comments', []):
+                pairs.append(('', c['text']))
+                pairs.append((sig['title'], c['text']))
+    return pairs
+
+
+def reference(title, text):
+    return classify_intent_reference(title, text), detect_monetisation_reference(title, text)
+
+
+def current(title, text):
+    return HNCollector.classify_intent(title, text), HNCollector.detect_monetisation(title, text)
+
+
+def check(inputs):
+    mismatches = [pair for pair in inputs if current(*pair) != reference(*pair)]
+    for title, text in mismatches[:5]:
+        print(f"  MISMATCH {title!r:.40} / {text!r:.60}\n"
+              f"    new: {current(title, text)}\n    old: {reference(title, text)}")
+    return mismatches
+
+
+def timed(fn, pairs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for title, text in pairs:
+            fn(title, text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PatternScanner golden check + micro-benchmark.")
+    parser.add_argument('--snapshots', nargs='+',
+                        default=sorted(glob.glob(os.path.join('hn_signals', 'raw', 'hn_signals_2*.json'))))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--fuzz', type=int, default=50000, help="random phrase-soup inputs")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.snapshots)
+    inputs = EDGE_CASES + corpus + fuzz_inputs(args.fuzz)
+    mismatches = check(inputs)
+    print(f"golden: {len(inputs) - len(mismatches)}/{len(inputs)} inputs identical "
+          f"({len(corpus)} snapshot texts, {len(EDGE_CASES)} edge cases, {args.fuzz} fuzzed)")
+
+    old = timed(reference, corpus, args.repeat)
+    new = timed(current, corpus, args.repeat)
+    print(f"snapshot texts: {len(corpus)}")
+    print(f"  reference      {old * 1e6 / len(corpus):7.1f} µs/text")
+    print(f"  PatternScanner {new * 1e6 / len(corpus):7.1f} µs/text   ({old / new:.2f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
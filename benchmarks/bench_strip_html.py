@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+strip_html benchmark
+====================
+Checks hn_collector.strip_html against the previous multi-pass version
+(kept below as the reference), then times both on comment-heavy threads.
+
+Snapshots store text that has already been stripped, so the golden corpus
+is rebuilt from them in the HN API's own markup: entities escaped (&#x27;,
+&#x2F; in hrefs), lines joined with <p>, URLs wrapped in <a href>,
+plus <i>/<pre><code> blocks, hand-written edge cases and seeded malformed
+markup. Every input must come out identical; the script exits non-zero
+otherwise.
+
+Usage:
+  python3 benchmarks/bench_strip_html.py
+  python3 benchmarks/bench_strip_html.py --snapshots hn_signals/raw/hn_signals_2*.json --repeat 5
+"""
+
+import argparse
+import glob
+import html
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hn_collector import MAX_COMMENTS_PER_POST, load_snapshot, strip_html  # noqa: E402
+
+URL = re.compile(r'(https?://\S+)')
+
+EDGE_CASES = [
+    '', 'plain text', '  padded \t text  ',
+    '<p>', '<p><p><p><p>', 'a<p><p><p><p>b', 'one<P>two', '<p >x',
+    '<a href="https:&#x2F;&#x2F;example.com&#x2F;a?b=1&amp;c=2" rel="nofollow">https:&#x2F;&#x2F;example.com&#x2F;a?b=1&amp;c=2</a>',
+    "<a href='single.html'>single</a>", '<a name="x">no href</a>', '<a\nhref="nl">x</a>',
+    '<a class="c" href="first" data-href="second">x</a>', '<a href="x>y">odd</a>',
+    '&amp; &lt;p&gt; &#39; &#x27; &quot; &nbsp; &copy &ampfoo &notit; &#9;tab &#32;&#32;sp',
+    '&#; &#x; &# &; & alone &&amp; &' + 'a' * 40 + ';',
+    '&amp<b>bold</b>&lt', '<i>italic</i><pre><code>  indented\n    code\n</code></pre>',
+    'unclosed <b tag', 'a < b and c > d', '<<b>>', '<!-- comment --> after',
+    'lines\n\n\n\n\nmany', 'mixed \n \n \n gaps', '&#10;&#10;&#10;entity lines',
+    '\t\ttabs\t<p>\tand<p>\t\tspaces  ',
+]
+
+# Malformed-markup soup: bare '<', '>' and markup inside hrefs, entity fragments
+FUZZ_TOKENS = [
+    '<p>', '<a href="u">', "<a href='v' x>", '<a href="<p>">', '<a href="a>b">', '</a>',
+    '<a name=x>', '<i>', '<b', '<a\n', 'href="q">', '<', '>', '"', "'", '/', ';', '#',
+    '&#x2F;', '&#x27;', '&quot;', '&gt;', '&lt;', '&amp;', '&amp', '&not', '&notin;',
+    '&#39', '&#x2', '&#10;', '&#32;', '&', 'amp', 'lt', 'x', 'F', ' ', '\t', '\n', '\n\n\n',
+]
+
+
+def fuzz_inputs(n, seed=23):
+    rnd = random.Random(seed)
+    return [''.join(rnd.choice(FUZZ_TOKENS) for _ in range(rnd.randint(1, 30)))
+            for _ in range(n)]
+
+
+def strip_html_reference(text):
+    """strip_html before the single-pass rewrite (five regex passes + unescape)."""
+    if not text:
+        return ''
+    text = re.sub(r'<a\s[^>]*href=["\']([^"\']+)["\'][^>]*>', r' \1 ', text)  # keep hrefs
+    text = re.sub(r'<p>', '\n', text)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = html.unescape(text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def to_hn_html(text):
+    """Stored plain text → markup shaped like an Algolia story_text / comment_text."""
+    def link(url):
+        href = html.escape(url).replace('/', '&#x2F;')
+        return f'<a href="{href}" rel="nofollow">{href}</a>'
+    paragraphs = []
+    for i, para in enumerate(text.split('\n')):
+        # split() with a group: odd items are the URLs
+        body = ''.join(link(part) if k % 2 else html.escape(part)
+                       for k, part in enumerate(URL.split(para)))
+        if i % 7 == 3:
+            body = f'<i>{body}</i>'
+        elif i % 11 == 5:
+            body = f'<pre><code>  {body}\n</code></pre>'
+        paragraphs.append(body)
+    return '<p>'.join(paragraphs)
+
+
+def load_corpus(paths):
+    """(post bodies, comment threads) as HN markup, plus the stored plain texts."""
+    bodies, threads, plain, seen = [], [], [], set()
+    for path in paths:
+        for sig in load_snapshot(path)['signals']:
+            if sig['hn_id'] in seen:
+                continue
+            seen.add(sig['hn_id'])
+            if sig.get('body_text'):
+                bodies.append(to_hn_html(sig['body_text']))
+                plain.append(sig['body_text'])
+            plain.extend(c['text'] for c in sig.get('top_comments', []))
+            comments = [to_hn_html(c['text']) for c in sig.get('top_comments', [])]
+            if comments:
+                threads.append(comments)
+    return bodies, threads, plain
+
+
+def check(inputs):
+    mismatches = [t for t in inputs if strip_html(t) != strip_html_reference(t)]
+    for t in mismatches[:5]:
+        print(f"  MISMATCH {t[:80]!r}\n    new: {strip_html(t)[:80]!r}\n"
+              f"    old: {strip_html_reference(t)[:80]!r}")
+    return mismatches
+
+
+def timed(fn, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="strip_html golden check + micro-benchmark.")
+    parser.add_argument('--snapshots', nargs='+',
+                        default=sorted(glob.glob(os.path.join('hn_signals', 'raw', 'hn_signals_2*.json'))))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--fuzz', type=int, default=50000, help="random malformed inputs")
+    args = parser.parse_args(argv)
+
+    bodies, threads, plain = load_corpus(args.snapshots)
+    comments = [c for thread in threads for c in thread]
+    inputs = EDGE_CASES + bodies + comments + plain + fuzz_inputs(args.fuzz)
+    mismatches = check(inputs)
+    print(f"golden: {len(inputs) - len(mismatches)}/{len(inputs)} inputs identical "
+          f"({len(bodies)} bodies, {len(comments)} comments, {len(plain)} stored texts, "
+          f"{len(EDGE_CASES)} edge cases, {args.fuzz} fuzzed)")
+
+    # comment-heavy threads: the collector strips up to MAX_COMMENTS_PER_POST per post
+    heavy = [c for thread in threads if len(thread) >= MAX_COMMENTS_PER_POST // 2 for c in thread]
+    mb = sum(len(t) for t in heavy) / 1e6
+    old = timed(strip_html_reference, heavy, args.repeat)
+    new = timed(strip_html, heavy, args.repeat)
+    print(f"comment-heavy threads: {len(heavy)} comments, {mb:.1f} MB")
+    print(f"  reference  {old * 1e6 / len(heavy):7.1f} µs/comment")
+    print(f"  strip_html {new * 1e6 / len(heavy):7.1f} µs/comment   ({old / new:.2f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
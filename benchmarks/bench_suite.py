@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite
+=====================
+Times the analysis hot paths over the recorded snapshots in
+hn_signals/raw/ — no network. Each benchmark runs over the whole fixture
+corpus; the best of --repeat rounds is kept and reported per corpus (ms)
+and per item (µs).
+
+Snapshots store already-built signals, so the raw inputs are rebuilt from
+them: Algolia-shaped posts and comments with HN markup (see
+bench_strip_html.to_hn_html) for the collector, Firebase-shaped stories
+for HNAnalyzer, HNSignal objects for generate_briefing.
+
+Results are written as JSON; `compare` flags every benchmark whose
+per-item time grew by more than --threshold against a baseline and exits
+non-zero if any did.
+
+Usage:
+  python3 benchmarks/bench_suite.py run --out baseline.json
+  python3 benchmarks/bench_suite.py run --baseline baseline.json   # run, save, compare
+  python3 benchmarks/bench_suite.py compare baseline.json benchmarks/results/bench_20260301_120000.json
+  python3 benchmarks/bench_suite.py run --only strip_html build_signal
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_strip_html import to_hn_html  # noqa: E402
+from hn_collector import HNCollector, load_snapshot, strip_html  # noqa: E402
+from hn_module import HNAnalyzer, HNSignal, HNSignalDetector  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_FIXTURES = os.path.join('hn_signals', 'raw', 'hn_signals_2*.json')
+REGRESSION_THRESHOLD = 0.10   # +10% per item counts as a regression
+
+
+# ── Fixtures ───────────────────────────────────────────────────────────────
+
+def load_fixtures(paths):
+    """Distinct signals across the snapshots (newest version of each hn_id)."""
+    by_id = {}
+    for path in sorted(paths):
+        for sig in load_snapshot(path)['signals']:
+            by_id[sig['hn_id']] = sig
+    return list(by_id.values())
+
+
+def algolia_post(sig):
+    return {
+        'objectID': sig['hn_id'],
+        'title': sig['title'],
+        'url': sig.get('url') or '',
+        'author': sig['author'],
+        'points': sig['points'],
+        'num_comments': sig['num_comments'],
+        'created_at': sig['created_at'],
+        'created_at_i': sig['created_at_ts'],
+        'story_text': to_hn_html(sig['body_text']) if sig.get('body_text') else None,
+    }
+
+
+def algolia_comments(sig):
+    return [{'author': c['author'], 'comment_text': to_hn_html(c['text']),
+             'points': c.get('points')} for c in sig.get('top_comments', [])]
+
+
+def firebase_story(sig):
+    return {
+        'type': 'story', 'id': int(sig['hn_id']), 'title': sig['title'],
+        'text': sig.get('body_text'), 'url': sig.get('url'), 'by': sig['author'],
+        'score': sig['points'], 'descendants': sig['num_comments'],
+        'time': sig['created_at_ts'],
+        'comments': [{'author': c['author'], 'text': c['text']}
+                     for c in sig.get('top_comments', [])],
+    }
+
+
+def hn_signal(sig, analysis):
+    return HNSignal(
+        hn_id=int(sig['hn_id']), title=sig['title'], url=sig.get('url'),
+        author=sig['author'],
+        created_at=datetime.fromtimestamp(sig['created_at_ts']),
+        score=sig['points'], num_comments=sig['num_comments'],
+        inferred_problem=sig['title'][:200],
+        builder_present=analysis['builder_present'],
+        technical_depth_score=analysis['technical_depth_score'],
+        signal_type=analysis['signal_type'],
+        github_links=analysis['links']['github'], demo_links=analysis['links']['demo'],
+        docs_links=analysis['links']['docs'], text=sig.get('body_text'),
+        comment_sample=sig.get('top_comments', [])[:5],
+    )
+
+
+# ── Benchmarks ─────────────────────────────────────────────────────────────
+
+def build_benchmarks(signals):
+    """name → (items, fn over the whole item list)."""
+    posts = [algolia_post(s) for s in signals]
+    comments = [algolia_comments(s) for s in signals]
+    markup = ([p['story_text'] for p in posts if p['story_text']]
+              + [c['comment_text'] for cs in comments for c in cs])
+    texts = [(s['title'], s.get('body_text') or '') for s in signals]
+    link_texts = [f"{s.get('body_text') or ''} {s.get('url') or ''}" for s in signals]
+    jobs = [(p, 'show_hn' if s['type'] == 'show_hn' else 'technical_thread', c)
+            for p, s, c in zip(posts, signals, comments)]
+    stories = [firebase_story(s) for s in signals]
+    analyzer = HNAnalyzer()
+    analyses = analyzer.analyze_batch(stories)
+    hn_signals = [hn_signal(s, a) for s, a in zip(signals, analyses)]
+    detector = HNSignalDetector(use_cache=False)
+
+    def analyze_each(items):
+        for st in items:
+            analyzer.detect_builder_presence(st['title'], st['text'], st['comments'], st['by'])
+            analyzer.calculate_technical_depth(st['title'], st['text'], st['comments'])
+            analyzer.extract_links(st['title'], st['text'], st['url'])
+            analyzer.infer_problem(st['title'], st['text'])
+
+    return {
+        'strip_html': (markup, lambda items: [strip_html(t) for t in items]),
+        'extract_links': (link_texts, lambda items: [HNCollector.extract_links(t) for t in items]),
+        'classify_intent': (texts, lambda items: [HNCollector.classify_intent(*t) for t in items]),
+        'detect_monetisation': (texts,
+                                lambda items: [HNCollector.detect_monetisation(*t) for t in items]),
+        'build_signal': (jobs, lambda items: [HNCollector.build_signal(*j) for j in items]),
+        'analyzer_per_story': (stories, analyze_each),
+        'analyzer_batch': (stories, analyzer.analyze_batch),
+        'generate_briefing': (hn_signals, detector.generate_briefing),
+    }
+
+
+def time_benchmark(items, fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(items)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(fixture_paths, repeat, only=None):
+    signals = load_fixtures(fixture_paths)
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmarks = build_benchmarks(signals)
+    results = {}
+    for name, (items, fn) in benchmarks.items():
+        if only and name not in only:
+            continue
+        seconds = time_benchmark(items, fn, repeat)
+        results[name] = {
+            'items': len(items),
+            'corpus_ms': round(seconds * 1e3, 3),
+            'per_item_us': round(seconds * 1e6 / max(len(items), 1), 3),
+        }
+        print(f"  {name:<22} {len(items):>7} items {seconds * 1e3:>10.1f} ms "
+              f"{results[name]['per_item_us']:>10.2f} µs/item", flush=True)
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'fixtures': sorted(os.path.basename(p) for p in fixture_paths),
+            'signals': len(signals),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Print a per-benchmark comparison; returns the names that regressed."""
+    regressed = []
+    print(f"  {'benchmark':<22} {'baseline µs':>12} {'current µs':>12} {'change':>8}")
+    for name, cur in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"  {name:<22} {'-':>12} {cur['per_item_us']:>12.2f}      new")
+            continue
+        change = cur['per_item_us'] / base['per_item_us'] - 1 if base['per_item_us'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressed.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"  {name:<22} {base['per_item_us']:>12.2f} {cur['per_item_us']:>12.2f} "
+              f"{change:>+8.1%}{flag}")
+    if baseline['meta'].get('signals') != current['meta'].get('signals'):
+        print(f"  [WARN] fixtures differ: {baseline['meta'].get('signals')} vs "
+              f"{current['meta'].get('signals')} signals")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks over recorded HN snapshots.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    r = sub.add_parser('run', help="time every benchmark and save the results")
+    r.add_argument('--fixtures', nargs='+', default=None,
+                   help=f"snapshot files (default: {DEFAULT_FIXTURES})")
+    r.add_argument('--repeat', type=int, default=5)
+    r.add_argument('--only', nargs='+', help="benchmark names to run")
+    r.add_argument('--out', help=f"results file (default: {RESULTS_DIR}/bench_<timestamp>.json)")
+    r.add_argument('--baseline', help="compare against this results file afterwards")
+    r.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    c = sub.add_parser('compare', help="flag regressions of a run against a baseline")
+    c.add_argument('baseline')
+    c.add_argument('current')
+    c.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        fixtures = args.fixtures or glob.glob(DEFAULT_FIXTURES)
+        if not fixtures:
+            print(f"no fixtures match {DEFAULT_FIXTURES}", file=sys.stderr)
+            return 2
+        current = run(fixtures, args.repeat, args.only)
+        out = args.out
+        if out is None:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+            out = os.path.join(RESULTS_DIR, f"bench_{stamp}.json")
+        with open(out, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"  results → {out}")
+        if not args.baseline:
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+    regressed = compare(baseline, current, args.threshold)
+    if regressed:
+        print(f"  {len(regressed)} regression(s) over {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    print(f"  no regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
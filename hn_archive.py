@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+HN Signal Archive
+=================
+Content-addressed, deduplicated history of collector snapshots.
+
+Every weekly snapshot repeats most of the previous week's signals, and is
+written twice (dated + latest). The archive stores each distinct signal
+version once, keyed by hn_id + content hash; a changed signal is stored as
+a delta against its previous version (points, num_comments, new links …).
+Any historical snapshot can be rebuilt exactly.
+
+Layout (<archive_dir>/):
+  objects.jsonl   one object per line, append-only
+                  {"hash", "hn_id", "data": {...}}                 full version
+                  {"hash", "hn_id", "base", "set": {...}, "unset": [...]}  delta
+  runs.jsonl      one run per line, appended last (the commit point)
+                  {"run", "meta", "signals": [[hn_id, hash], ...]}
+
+Usage:
+  python3 hn_archive.py import hn_signals/raw/hn_signals_2*.json
+  python3 hn_archive.py list
+  python3 hn_archive.py rebuild 20260223_075507 snapshot.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from hn_collector import load_snapshot
+
+DEFAULT_ARCHIVE_DIR = os.path.join('hn_signals', 'archive')
+MAX_DELTA_CHAIN = 16  # store a full version after this many deltas
+
+
+def content_hash(signal):
+    canonical = json.dumps(signal, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:20]
+
+
+def run_id_from_path(path):
+    m = re.search(r'(\d{8}_\d{6})', os.path.basename(path))
+    return m.group(1) if m else None
+
+
+class SignalArchive:
+    """Append-only object store of signal versions plus per-run manifests."""
+
+    def __init__(self, archive_dir=DEFAULT_ARCHIVE_DIR):
+        self.dir = archive_dir
+        self.objects_path = os.path.join(archive_dir, 'objects.jsonl')
+        self.runs_path = os.path.join(archive_dir, 'runs.jsonl')
+        self._objects = None   # hash → stored record
+        self._latest = None    # hn_id → hash of its newest version
+        self._resolved = {}    # hash → full signal (memo)
+
+    # ── Loading ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _read_jsonl(path):
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _load(self):
+        if self._objects is not None:
+            return
+        self._objects, self._latest = {}, {}
+        for rec in self._read_jsonl(self.objects_path):
+            self._objects[rec['hash']] = rec
+            self._latest[rec['hn_id']] = rec['hash']
+
+    def runs(self):
+        return list(self._read_jsonl(self.runs_path))
+
+    def resolve(self, h):
+        """Full signal for a content hash, applying its delta chain."""
+        self._load()
+        if h in self._resolved:
+            return self._resolved[h]
+        chain = []
+        while h not in self._resolved:
+            rec = self._objects[h]
+            chain.append(rec)
+            if 'data' in rec:
+                break
+            h = rec['base']
+        signal = None
+        for rec in reversed(chain):
+            if 'data' in rec:
+                signal = rec['data']
+            else:
+                base = self._resolved[rec['base']] if signal is None else signal
+                signal = {k: v for k, v in base.items() if k not in rec['unset']}
+                signal.update(rec['set'])
+            self._resolved[rec['hash']] = signal
+        return signal
+
+    def _chain_length(self, h):
+        n = 0
+        while 'data' not in self._objects[h]:
+            h = self._objects[h]['base']
+            n += 1
+        return n
+
+    # ── Writing ────────────────────────────────────────────────────────
+
+    def add_snapshot(self, snapshot, run_id):
+        """Archive one collector output; returns (new_objects, deltas)."""
+        self._load()
+        if any(r['run'] == run_id for r in self.runs()):
+            return 0, 0
+        os.makedirs(self.dir, exist_ok=True)
+
+        refs, new_records = [], []
+        deltas = 0
+        for sig in snapshot['signals']:
+            hn_id = str(sig.get('hn_id'))
+            h = content_hash(sig)
+            refs.append([hn_id, h])
+            if h in self._objects:
+                self._latest[hn_id] = h
+                continue
+            prev = self._latest.get(hn_id)
+            if prev and self._chain_length(prev) < MAX_DELTA_CHAIN:
+                base = self.resolve(prev)
+                rec = {
+                    'hash': h, 'hn_id': hn_id, 'base': prev,
+                    'set': {k: v for k, v in sig.items() if k not in base or base[k] != v},
+                    'unset': [k for k in base if k not in sig],
+                }
+                deltas += 1
+            else:
+                rec = {'hash': h, 'hn_id': hn_id, 'data': sig}
+            self._objects[h] = rec
+            self._latest[hn_id] = h
+            new_records.append(rec)
+
+        with open(self.objects_path, 'a', encoding='utf-8') as f:
+            for rec in new_records:
+                f.write(json.dumps(rec, ensure_ascii=False, separators=(',', ':')) + '\n')
+        with open(self.runs_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'run': run_id, 'meta': snapshot.get('meta', {}),
+                                'signals': refs}, ensure_ascii=False,
+                               separators=(',', ':')) + '\n')
+        return len(new_records), deltas
+
+    def add_snapshot_file(self, path):
+        run_id = run_id_from_path(path)
+        if run_id is None:
+            raise ValueError(f"no YYYYMMDD_HHMMSS run id in {path}")
+        return self.add_snapshot(load_snapshot(path), run_id)
+
+    # ── Reading ────────────────────────────────────────────────────────
+
+    def snapshot(self, run_id):
+        """Rebuild the {'meta', 'signals'} output of a past run."""
+        for run in self.runs():
+            if run['run'] == run_id:
+                return {'meta': run['meta'],
+                        'signals': [dict(self.resolve(h)) for _, h in run['signals']]}
+        raise KeyError(run_id)
+
+    def history(self, hn_id):
+        """Every archived version of one signal, oldest first: [(run_id, signal)]."""
+        hn_id, seen, versions = str(hn_id), set(), []
+        for run in self.runs():
+            for sid, h in run['signals']:
+                if sid == hn_id and h not in seen:
+                    seen.add(h)
+                    versions.append((run['run'], self.resolve(h)))
+        return versions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deduplicated HN snapshot archive.")
+    parser.add_argument('--dir', default=DEFAULT_ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    imp = sub.add_parser('import', help="archive dated snapshot files, oldest first")
+    imp.add_argument('paths', nargs='+')
+    sub.add_parser('list', help="list archived runs")
+    reb = sub.add_parser('rebuild', help="write a past snapshot back out")
+    reb.add_argument('run')
+    reb.add_argument('output', nargs='?')
+    args = parser.parse_args(argv)
+
+    archive = SignalArchive(args.dir)
+    if args.command == 'import':
+        for path in sorted(args.paths, key=lambda p: run_id_from_path(p) or ''):
+            if run_id_from_path(path) is None:
+                print(f"  skip {path} (no run id — e.g. *_latest.json duplicates a dated run)")
+                continue
+            new, deltas = archive.add_snapshot_file(path)
+            print(f"  {path}: {new} new objects ({deltas} deltas)")
+    elif args.command == 'list':
+        for run in archive.runs():
+            print(f"  {run['run']}  {len(run['signals']):>5} signals  "
+                  f"collected {run['meta'].get('collected_at', '?')}")
+    else:
+        snap = archive.snapshot(args.run)
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        json.dump(snap, out, indent=2, ensure_ascii=False)
+        if args.output:
+            out.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
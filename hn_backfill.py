@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+HN Signal Backfill
+==================
+Collects historical signals one UTC day at a time, built on HNCollector.
+
+  - one output file per day: <output_dir>/backfill/hn_signals_YYYYMMDD.json
+    (same {'meta', 'signals'} layout as hn_collector.py)
+  - a checkpoint journal (<output_dir>/backfill/journal.jsonl) records every
+    finished day, so an interrupted run picks up where it stopped
+  - several days run concurrently, all behind one shared rate limiter and
+    response cache, so the global request budget is respected
+
+A day whose collection hit API errors is journaled as 'partial' and retried
+on the next run.
+
+Usage:
+  python3 hn_backfill.py <days_back> [output_dir] [--parallel N]
+  python3 hn_backfill.py --start 2025-01-01 --end 2025-12-31 hn_signals
+"""
+
+import argparse
+import json
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+
+from hn_cache import ResponseCache
+from hn_collector import HNCollector
+from hn_ratelimit import AdaptiveRateLimiter
+
+PARALLEL_PARTITIONS = 3
+JOURNAL_NAME = 'journal.jsonl'
+
+
+def day_partitions(start, end):
+    """UTC days from start to end inclusive, newest first."""
+    day = end
+    while day >= start:
+        yield day
+        day -= timedelta(days=1)
+
+
+def partition_bounds(day):
+    since = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return int(since.timestamp()), int((since + timedelta(days=1)).timestamp())
+
+
+class Backfill:
+    """Checkpointed, resumable day-by-day collection."""
+
+    def __init__(self, start, end, output_dir='hn_signals',
+                 parallel=PARALLEL_PARTITIONS, use_cache=True, algolia_base=None):
+        self.start = start
+        self.end = end
+        self.dir = os.path.join(output_dir, 'backfill')
+        self.parallel = max(1, parallel)
+        self.algolia_base = algolia_base
+        self.journal_path = os.path.join(self.dir, JOURNAL_NAME)
+        # shared by every partition: one request budget, one cache
+        self.limiter = AdaptiveRateLimiter()
+        self.cache = ResponseCache() if use_cache else None
+        self._journal_lock = threading.Lock()
+
+    # ── Journal ────────────────────────────────────────────────────────
+
+    def load_journal(self):
+        """Latest journal entry per partition."""
+        entries = {}
+        if not os.path.exists(self.journal_path):
+            return entries
+        with open(self.journal_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                entries[entry['partition']] = entry
+        return entries
+
+    def _repair_journal(self):
+        """Terminate a line torn by a crash so new entries start clean."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+
+    def _journal(self, entry):
+        entry['recorded_at'] = datetime.now(timezone.utc).isoformat()
+        with self._journal_lock, open(self.journal_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def pending(self):
+        journal = self.load_journal()
+        todo = []
+        for day in day_partitions(self.start, self.end):
+            entry = journal.get(day.isoformat())
+            if entry and entry['status'] == 'done' and os.path.exists(
+                    os.path.join(self.dir, entry['file'])):
+                continue
+            todo.append(day)
+        return todo
+
+    # ── Partitions ─────────────────────────────────────────────────────
+
+    def partition_path(self, day):
+        return os.path.join(self.dir, f"hn_signals_{day.strftime('%Y%m%d')}.json")
+
+    def run_partition(self, day):
+        since_ts, until_ts = partition_bounds(day)
+        collector = HNCollector(lookback_days=(datetime.now(timezone.utc).date() - day).days + 1,
+                                output_dir=self.dir, limiter=self.limiter,
+                                cache=self.cache, use_cache=self.cache is not None,
+                                algolia_base=self.algolia_base)
+        show_hn = collector.collect_show_hn(since_ts, until_ts)
+        threads = collector.collect_threads(since_ts, until_ts)
+        signals = collector.sort_signals(collector.build_signals(show_hn, threads))
+
+        output = {
+            'meta': {
+                'collected_at': datetime.now(timezone.utc).isoformat(),
+                'partition': day.isoformat(),
+                'since': datetime.fromtimestamp(since_ts, tz=timezone.utc).isoformat(),
+                'until': datetime.fromtimestamp(until_ts, tz=timezone.utc).isoformat(),
+                'total_signals': len(signals),
+                'stats': dict(collector.stats),
+            },
+            'signals': signals,
+        }
+        path = self.partition_path(day)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
+        errors = collector.failed_requests()
+        return {
+            'partition': day.isoformat(),
+            'status': 'partial' if errors else 'done',
+            'file': os.path.basename(path),
+            'signals': len(signals),
+            'api_calls': collector.stats['api_calls'],
+            'api_errors': errors,
+        }
+
+    def run(self):
+        os.makedirs(self.dir, exist_ok=True)
+        self._repair_journal()
+        todo = self.pending()
+        total = sum(1 for _ in day_partitions(self.start, self.end))
+        print(f"Backfill {self.start} → {self.end}: {total - len(todo)}/{total} "
+              f"days already done, {len(todo)} to go ({self.parallel} in parallel)")
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+            futures = {pool.submit(self.run_partition, day): day for day in todo}
+            for future in as_completed(futures):
+                day = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    traceback.print_exc()
+                    entry = {'partition': day.isoformat(), 'status': 'failed',
+                             'error': str(e)}
+                if entry['status'] != 'done':
+                    failed += 1
+                self._journal(entry)
+                print(f"  [{entry['status']:>7}] {entry['partition']}"
+                      f"  {entry.get('signals', 0)} signals")
+
+        print(f"Backfill finished: {len(todo) - failed} done, {failed} to retry")
+        return failed == 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Resumable day-by-day HN backfill.")
+    parser.add_argument('days_back', nargs='?', type=int, default=None)
+    parser.add_argument('output_dir', nargs='?', default='hn_signals')
+    parser.add_argument('--start', type=date.fromisoformat, help="first day (UTC)")
+    parser.add_argument('--end', type=date.fromisoformat, help="last day (UTC), default today")
+    parser.add_argument('--parallel', type=int, default=PARALLEL_PARTITIONS,
+                        help="days collected concurrently (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--algolia-base', help="Algolia API root (default: the real HN search API)")
+    args = parser.parse_args(argv)
+    if args.start is None and args.days_back is None:
+        parser.error("give days_back or --start")
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    end = args.end or datetime.now(timezone.utc).date()
+    start = args.start or end - timedelta(days=args.days_back - 1)
+    ok = Backfill(start, end, args.output_dir, parallel=args.parallel,
+                  use_cache=not args.no_cache, algolia_base=args.algolia_base).run()
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,140 @@
+"""
+Persistent response cache for the HN APIs
+=========================================
+SQLite-backed key/value store for Firebase items and Algolia query results,
+shared by HNFetcher and HNCollector so repeated and overlapping runs are
+served from local disk.
+
+Entries expire according to the age of the content they hold: a story
+posted an hour ago is still collecting points and comments, a story from
+last month will never change again. The file is kept under `max_bytes`
+by evicting expired entries first, then least recently used ones.
+
+Usage:
+  cache = ResponseCache()                      # .hn_cache/responses.sqlite3
+  cache.set(key, payload, ttl_for_age(age))
+  cache.get(key)                               # → payload or None
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+# ── Configuration ──────────────────────────────────────────────────────────
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    'HN_CACHE_PATH', os.path.join('.hn_cache', 'responses.sqlite3'))
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+EVICT_TO = 0.9                    # shrink to this fraction of max when full
+
+FRESH_TTL = 5 * 60                # content that is still moving
+IMMUTABLE_TTL = 365 * 24 * 3600   # old items never change again
+
+# (max content age, ttl) — first matching tier wins
+TTL_TIERS = [
+    (3600,          FRESH_TTL),
+    (24 * 3600,     30 * 60),
+    (3 * 24 * 3600, 3 * 3600),
+    (14 * 24 * 3600, 24 * 3600),
+]
+
+
+def ttl_for_age(age_seconds):
+    """TTL for content whose newest part is `age_seconds` old."""
+    for max_age, ttl in TTL_TIERS:
+        if age_seconds < max_age:
+            return ttl
+    return IMMUTABLE_TTL
+
+
+def cache_key(url, params=None):
+    """Stable key for a GET request."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+class ResponseCache:
+    """Size-bounded, TTL-aware SQLite cache of decoded JSON responses."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key         TEXT PRIMARY KEY,
+                value       TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                expires_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        self._db.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed '
+                         'ON responses (accessed_at)')
+        self._total = self._db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+            self._db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?',
+                             (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            return
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        size = len(payload) + len(key)
+        with self._lock:
+            old = self._db.execute('SELECT size FROM responses WHERE key = ?',
+                                   (key,)).fetchone()
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                (key, payload, size, now + ttl, now))
+            self._total += size - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now):
+        target = int(self.max_bytes * EVICT_TO)
+        self._db.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        self._total = self._db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if self._total <= target:
+            return
+        freed = 0
+        cutoff = None
+        rows = self._db.execute(
+            'SELECT accessed_at, size FROM responses ORDER BY accessed_at')
+        for accessed_at, size in rows:
+            freed += size
+            cutoff = accessed_at
+            if self._total - freed <= target:
+                break
+        rows.close()
+        self._db.execute('DELETE FROM responses WHERE accessed_at <= ?', (cutoff,))
+        self._total = self._db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -13,26 +13,46 @@ Targets:
 Output: JSON file with structured HNSignal objects
 
 Usage:
-  python3 hn_collector.py [lookback_days] [output_dir]
+  python3 hn_collector.py [lookback_days] [output_dir] [--incremental] [--no-cache]
   python3 hn_collector.py 30 ./hn_signals
+  python3 hn_collector.py 7 ./hn_signals --incremental
+  python3 hn_collector.py 30 ./hn_signals --format packed
+  python3 hn_collector.py 365 ./hn_signals --format jsonl --no-sort
+  python3 hn_collector.py 7 ./hn_signals --comment-budget 500 --deadline 600
+  python3 hn_collector.py 365 ./hn_signals --format jsonl --build-workers 4
 """
 
+import argparse
 import requests
 import json
 import time
 import re
 import os
-import sys
+import heapq
 import html
+import itertools
+import math
+import shutil
+import tempfile
 from datetime import datetime, timedelta, timezone
 from urllib.parse import urlparse
-from collections import defaultdict
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from hn_cache import FRESH_TTL, ResponseCache, cache_key, ttl_for_age
+import hn_pack
+from hn_ratelimit import (AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError,
+                          backoff_delay, parse_retry_after)
 
 # ── Configuration ──────────────────────────────────────────────────────────
 
 ALGOLIA_BASE = "https://hn.algolia.com/api/v1"
 HITS_PER_PAGE = 200
-REQUEST_DELAY = 0.3  # seconds between API calls
+MAX_RETRIES = 4                  # retries per request on 429 / 5xx / network errors
+REQUEST_TIMEOUT = 30             # seconds per request (less when a deadline is closer)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
 
 # Collection thresholds
 MIN_POINTS_SHOW_HN = 3           # low bar — catch early signals
@@ -41,6 +61,47 @@ MIN_COMMENTS_THREAD = 25         # "high engagement" bar
 COMMENT_FETCH_MIN_POINTS = 15    # fetch comments when post has this many points
 COMMENT_FETCH_MIN_COMMENTS = 10  # or this many comments
 MAX_COMMENTS_PER_POST = 12       # top N comments to store
+ENGAGEMENT_WINDOW_DAYS = 2       # incremental runs re-poll posts this young
+
+# Time-sharded pagination
+ALGOLIA_HIT_CAP = 1000           # hits reachable per query, whatever nbHits says
+SHARD_WORKERS = 4                # windows / pages fetched concurrently
+SHARD_GRID = 3600                # window edges are queried on whole hours (stable cache keys)
+UNTIL_FILTER_RE = re.compile(r'created_at_i<=?(\d+)')   # a listing window's upper bound
+
+# Comment pipeline
+COMMENT_WORKERS = 8              # concurrent comment fetches (one shared rate limit)
+PIPELINE_DEPTH = 32              # posts buffered ahead of build_signal
+
+# Streaming page source: the lookback is walked in aligned windows, newest
+# first, with only a few windows of hits in memory at once
+SOURCE_WINDOW_DAYS = 7
+SOURCE_PREFETCH = 1              # windows fetched ahead of the consumer
+
+# Batched comment retrieval (one Algolia query for many stories)
+COMMENT_BATCH_HIT_BUDGET = 1000  # Algolia stops paging after ~1000 hits per query
+COMMENT_BATCH_MAX_STORIES = 40   # story_<id> tags per OR group
+COMMENT_BATCH_MAX_STORY_COMMENTS = 150  # bigger threads are fetched on their own
+
+# Comment scheduler (--comment-budget / --deadline): expected-value weights
+SCHEDULER_WEIGHTS = {
+    'builder': 4.0, 'experimenter': 2.0, 'discussion': 0.0,
+    'github': 2.0, 'show_hn': 1.0,
+    'velocity': 1.5,           # × log1p(points per hour)
+    'discussion_size': 0.5,    # × log1p(num_comments)
+}
+DEADLINE_BUILD_RESERVE = 0.001   # seconds kept back per post for building + writing (~4x measured)
+
+# Snapshot file formats (--format) → extension
+OUTPUT_FORMATS = {'json': '.json', 'jsonl': '.jsonl', 'packed': '.hnpk'}
+SORT_RUN_SIZE = 5000  # signals held in memory per external-sort run (streaming formats)
+
+# Process-pool build stage (--build-workers): signals built in worker processes
+BUILD_WORKERS = 0                # 0 = build in-process
+BUILD_POOL_MIN_POSTS = 400       # fewer posts than this are built in-process
+BUILD_SAMPLE_POSTS = 16          # built in-process first, to time a post
+BUILD_CHUNK_TARGET_S = 0.05      # worker time per chunk, amortising pickling + IPC
+BUILD_CHUNK_LIMITS = (8, 512)    # posts per chunk
 
 # ── Intent Patterns ────────────────────────────────────────────────────────
 
@@ -70,6 +131,48 @@ MONETISE_PATTERNS = [
     r'\bon.?prem\b', r'\bsign up\b', r'\bwaitlist\b',
 ]
 
+
+class PatternScanner:
+    """Every intent / monetisation pattern compiled into one alternation.
+
+    `scan` reports, per category, which patterns occur anywhere in the text
+    — the same answer as one `re.search` per pattern — from a single
+    left-to-right search. At each position where the combined regex matches,
+    the patterns not yet seen are tried in place, so overlapping or
+    same-start hits (e.g. "we're experimenting with") are never lost.
+    """
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self._rules = [(cat, p, re.compile(p))
+                       for cat, patterns in categories.items() for p in patterns]
+        self._combined = re.compile('|'.join(f'(?:{p})' for _, p, _ in self._rules))
+
+    def scan(self, text):
+        hit = [False] * len(self._rules)
+        remaining = len(self._rules)
+        search = self._combined.search
+        m = search(text)
+        while m and remaining:
+            start = m.start()
+            for i, (_, _, rx) in enumerate(self._rules):
+                if not hit[i] and rx.match(text, start):
+                    hit[i] = True
+                    remaining -= 1
+            m = search(text, start + 1)
+        found = {cat: [] for cat in self.categories}
+        for (cat, pattern, _), h in zip(self._rules, hit):
+            if h:
+                found[cat].append(pattern)
+        return found
+
+
+INTENT_SCANNER = PatternScanner({
+    'builder': BUILDER_PATTERNS,
+    'experimenter': EXPERIMENTER_PATTERNS,
+    'monetise': MONETISE_PATTERNS,
+})
+
 # ── Link Patterns ──────────────────────────────────────────────────────────
 
 GITHUB_REPO_RE = re.compile(r'https?://github\.com/([\w\-\.]+)/([\w\-\.]+)', re.I)
@@ -81,113 +184,760 @@ GITHUB_NOISE_PATHS = {'about', 'features', 'pricing', 'enterprise',
                       'collections', 'sponsors', 'notifications'}
 
 
+# ── HTML to text ───────────────────────────────────────────────────────────
+
+# One scanner for every tag strip_html rewrites: links (href kept inline),
+# <p> (newline) and any other tag (space), in a single left-to-right pass
+HTML_TAG_RE = re.compile(
+    r'<a\s[^>]*href=["\']([^"\']+)["\'][^>]*>'
+    r'|(<p>)'
+    r'|<[^>]+>')
+# The entities HN escapes text with; str.replace decodes them exactly as
+# html.unescape would (no other reference can overlap one). &amp; goes last.
+COMMON_ENTITIES = (('&#x2F;', '/'), ('&#x27;', "'"), ('&quot;', '"'),
+                   ('&gt;', '>'), ('&lt;', '<'))
+SPACES_RE = re.compile(r'[ \t]{2,}|\t')
+BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+class _NestedMarkup(Exception):
+    """A bare '<' or an href holding '<' / '>': HN never sends these."""
+
+
+def _html_tag(m):
+    kind = m.lastindex
+    if kind == 2:
+        return '\n'
+    if kind == 1:
+        href = m.group(1)
+        if '<' in href or '>' in href:
+            raise _NestedMarkup
+        return f" {href} "
+    if '<' in m.group()[1:]:
+        raise _NestedMarkup
+    return ' '
+
+
+def _strip_tags_multipass(text):
+    """One pass per tag rule, in order — what HTML_TAG_RE mirrors for sane markup."""
+    text = re.sub(r'<a\s[^>]*href=["\']([^"\']+)["\'][^>]*>', r' \1 ', text)  # keep hrefs
+    text = text.replace('<p>', '\n')
+    return re.sub(r'<[^>]+>', ' ', text)
+
+
 def strip_html(text):
     """Strip HTML tags and decode entities."""
     if not text:
         return ''
-    text = re.sub(r'<a\s[^>]*href=["\']([^"\']+)["\'][^>]*>', r' \1 ', text)  # keep hrefs
-    text = re.sub(r'<p>', '\n', text)
-    text = re.sub(r'<[^>]+>', ' ', text)
-    text = html.unescape(text)
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    if '<' in text:
+        try:
+            text = HTML_TAG_RE.sub(_html_tag, text)
+        except _NestedMarkup:
+            text = _strip_tags_multipass(text)
+    if '&' in text:
+        for entity, char in COMMON_ENTITIES:
+            if entity in text:
+                text = text.replace(entity, char)
+        if '&' in text:
+            if text.count('&') == text.count('&amp;'):
+                text = text.replace('&amp;', '&')
+            else:
+                text = html.unescape(text)
+    text = SPACES_RE.sub(' ', text)
+    if '\n\n\n' in text:
+        text = BLANK_LINES_RE.sub('\n\n', text)
     return text.strip()
 
 
+# ── Snapshot files ─────────────────────────────────────────────────────────
+
+def signal_sort_key(signal):
+    """Builders first, then GitHub, monetisation language and points (descending)."""
+    return (signal['builder_present'], signal['has_github'],
+            signal['has_monetisation_language'], signal['points'])
+
+
+class JsonSnapshotWriter:
+    """Classic pretty-printed {'meta', 'signals'} file; buffers until close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.signals = []
+
+    def write(self, signal):
+        self.signals.append(signal)
+
+    def close(self, meta=None):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'meta': meta or {}, 'signals': self.signals}, f,
+                      indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+class JsonlSnapshotWriter:
+    """One signal per line, written as it arrives; meta is a final {"meta": …} line."""
+
+    def __init__(self, path):
+        self.path = path
+        self._tmp = f"{path}.tmp"
+        self._f = open(self._tmp, 'w', encoding='utf-8')
+
+    def write(self, signal):
+        self._f.write(json.dumps(signal, ensure_ascii=False) + '\n')
+
+    def close(self, meta=None):
+        self._f.write(json.dumps({'meta': meta or {}}, ensure_ascii=False) + '\n')
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+
+SNAPSHOT_WRITERS = {
+    '.json': JsonSnapshotWriter,
+    '.jsonl': JsonlSnapshotWriter,
+    '.hnpk': hn_pack.PackWriter,
+}
+
+
+def open_snapshot_writer(path):
+    """Writer (write(signal) … close(meta)) for the format implied by the extension."""
+    return SNAPSHOT_WRITERS[os.path.splitext(path)[1]](path)
+
+
+def load_snapshot(path):
+    """Load a collector output file ({'meta': …, 'signals': […]}) in any format."""
+    if path.endswith(OUTPUT_FORMATS['packed']):
+        return hn_pack.read_snapshot(path)
+    if path.endswith(OUTPUT_FORMATS['jsonl']):
+        signals, meta = [], {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if 'meta' in record:
+                    meta = record['meta']
+                else:
+                    signals.append(record)
+        return {'meta': meta, 'signals': signals}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_snapshot(path, output):
+    """Write collector output in the format implied by the file extension."""
+    writer = open_snapshot_writer(path)
+    for signal in output['signals']:
+        writer.write(signal)
+    writer.close(output.get('meta'))
+
+
+def publish_latest(dated, latest):
+    """Atomically point `latest` at the finished dated file (hard link, else copy)."""
+    tmp = f"{latest}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(dated, tmp)
+    except OSError:
+        shutil.copyfile(dated, tmp)
+    os.replace(tmp, latest)
+
+
+def latest_snapshot_path(output_dir='hn_signals'):
+    """Newest <output_dir>/raw/hn_signals_latest.* in any output format, or None."""
+    paths = [f"{output_dir}/raw/hn_signals_latest{ext}" for ext in OUTPUT_FORMATS.values()]
+    paths = [p for p in paths if os.path.exists(p)]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def external_sort(signals, key=signal_sort_key, reverse=True, run_size=SORT_RUN_SIZE):
+    """Sort a signal stream holding at most `run_size` signals in memory.
+
+    Sorted runs are spilled to temporary JSON Lines files and lazily merged.
+    Ties keep their input order, exactly like list.sort.
+    """
+    runs = []
+    try:
+        batch = []
+        for signal in signals:
+            batch.append(signal)
+            if len(batch) >= run_size:
+                runs.append(_spill_run(batch, key, reverse))
+                batch = []
+        batch.sort(key=key, reverse=reverse)
+        if not runs:
+            yield from batch
+            return
+        runs.append(_spill_run(batch, key, reverse))
+        streams = [(json.loads(line) for line in f) for f in runs]
+        yield from heapq.merge(*streams, key=key, reverse=reverse)
+    finally:
+        for f in runs:
+            f.close()
+
+
+def _spill_run(batch, key, reverse):
+    batch.sort(key=key, reverse=reverse)
+    f = tempfile.TemporaryFile('w+', encoding='utf-8')
+    for signal in batch:
+        f.write(json.dumps(signal, ensure_ascii=False) + '\n')
+    f.seek(0)
+    return f
+
+
+# ── Process-pool build stage ───────────────────────────────────────────────
+
+def _build_chunk(chunk):
+    """Worker: build_signal for a list of (post, post_type, comments)."""
+    return [HNCollector.build_signal(post, post_type, comments)
+            for post, post_type, comments in chunk]
+
+
+def build_chunk_size(seconds_per_post):
+    """Posts per chunk so each chunk is ~BUILD_CHUNK_TARGET_S of worker time."""
+    lo, hi = BUILD_CHUNK_LIMITS
+    if seconds_per_post <= 0:
+        return hi
+    return max(lo, min(hi, int(BUILD_CHUNK_TARGET_S / seconds_per_post)))
+
+
+def parallel_build(items, workers, min_posts=BUILD_POOL_MIN_POSTS, stats=None):
+    """Yield build_signal for each (post, post_type, comments), in input order.
+
+    Chunks of items go to a pool of `workers` processes, with at most two
+    chunks per worker in flight. Inputs shorter than `min_posts`, or a
+    single usable CPU, are built in-process, where the pool would cost
+    more than it saves.
+    """
+    workers = min(workers, os.cpu_count() or 1)
+    if workers <= 1:
+        # stream straight through: nothing is buffered ahead of the caller
+        for item in items:
+            yield HNCollector.build_signal(*item)
+        return
+
+    items = iter(items)
+    head = list(itertools.islice(items, min_posts))
+    if len(head) < min_posts:
+        for item in itertools.chain(head, items):
+            yield HNCollector.build_signal(*item)
+        return
+
+    # time the builds alone: yielding inside the timer would add the consumer's time
+    started = time.perf_counter()
+    sample = [HNCollector.build_signal(*item) for item in head[:BUILD_SAMPLE_POSTS]]
+    chunk = build_chunk_size((time.perf_counter() - started) / BUILD_SAMPLE_POSTS)
+    yield from sample
+    if stats is not None:
+        stats['build_workers'] = workers
+        stats['build_chunk'] = chunk
+
+    rest = itertools.chain(head[BUILD_SAMPLE_POSTS:], items)
+    del head
+    inflight = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in iter(lambda: list(itertools.islice(rest, chunk)), []):
+            inflight.append(pool.submit(_build_chunk, batch))
+            if len(inflight) >= 2 * workers:
+                yield from inflight.popleft().result()
+        while inflight:
+            yield from inflight.popleft().result()
+
+
+class DeadlineExceeded(Exception):
+    """A request given a deadline_at gave up because the deadline passed."""
+
+
 class HNCollector:
     """Collects and structures Hacker News signals."""
 
-    def __init__(self, lookback_days=30, output_dir="hn_signals"):
+    def __init__(self, lookback_days=30, output_dir="hn_signals", limiter=None,
+                 cache=None, use_cache=True, comment_workers=COMMENT_WORKERS,
+                 batch_comments=False, shard_workers=SHARD_WORKERS, output_format='json',
+                 comment_budget=None, deadline=None, build_workers=BUILD_WORKERS,
+                 algolia_base=None):
         self.lookback_days = lookback_days
+        # algolia_base points the collector at another server (e.g. hn_fake_server.py)
+        self.algolia_base = (algolia_base or ALGOLIA_BASE).rstrip('/')
+        self.build_workers = build_workers
+        # either one switches comment fetching over to a CommentScheduler
+        self.comment_budget = comment_budget
+        self.deadline = deadline          # seconds from the start of run()
         self.output_dir = output_dir
+        self.output_ext = OUTPUT_FORMATS[output_format]
         self.cutoff_ts = int(
             (datetime.now(timezone.utc) - timedelta(days=lookback_days)).timestamp()
         )
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "HNSignalCollector/1.0"})
+        self.comment_workers = max(1, comment_workers)
+        self.batch_comments = batch_comments
+        self.shard_workers = max(1, shard_workers)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=max(self.comment_workers, self.shard_workers))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.stats = defaultdict(int)
+        self._stats_lock = threading.Lock()
+        # one limiter + breaker for every request path (pagination, comments)
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.breaker = CircuitBreaker()
+        self.cache = cache or (ResponseCache() if use_cache else None)
 
     # ── API helpers ────────────────────────────────────────────────────
 
-    def _api_get(self, endpoint, params=None):
-        time.sleep(REQUEST_DELAY)
-        url = f"{ALGOLIA_BASE}/{endpoint}"
-        try:
-            resp = self.session.get(url, params=params, timeout=30)
-            resp.raise_for_status()
-            self.stats['api_calls'] += 1
-            return resp.json()
-        except requests.RequestException as e:
-            print(f"  [WARN] API error on {endpoint}: {e}")
-            self.stats['api_errors'] += 1
-            return None
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] += n
 
-    def _paginate(self, endpoint, params, max_pages=50):
-        all_hits = []
-        params = dict(params)
-        params['hitsPerPage'] = HITS_PER_PAGE
+    def failed_requests(self):
+        """Requests that gave up (errors, open circuit): their results are missing."""
+        return self.stats['api_errors'] + self.stats['api_circuit_open']
 
-        for page in range(max_pages):
-            params['page'] = page
-            data = self._api_get(endpoint, params)
-            if not data or not data.get('hits'):
-                break
-            all_hits.extend(data['hits'])
-            nb = data.get('nbPages', '?')
-            print(f"    page {page + 1}/{nb} — {len(all_hits)} hits")
-            if page + 1 >= data.get('nbPages', 0):
-                break
+    @staticmethod
+    def _response_ttl(params, data):
+        """Cache lifetime for an Algolia response, from the age of its content.
+
+        Listings live as long as their window's upper time bound is old
+        enough to stay unchanged; a window still open at the top (no bound,
+        or one in the future) shifts with every new post, so it only lives
+        briefly. Comment queries live as long as their newest hit.
+        """
+        params = params or {}
+        filters = str(params.get('numericFilters', ''))
+        tags = str(params.get('tags', ''))
+        if 'story_' not in tags:
+            until = UNTIL_FILTER_RE.search(filters)
+            if not until:
+                return FRESH_TTL
+            return ttl_for_age(time.time() - int(until.group(1)))
+        newest = max((h.get('created_at_i', 0) for h in data.get('hits', [])), default=0)
+        if not newest:
+            return FRESH_TTL
+        return ttl_for_age(time.time() - newest)
+
+    def _api_get(self, endpoint, params=None, deadline_at=None):
+        """Decoded JSON for one Algolia request, with retries; None on failure.
+
+        With `deadline_at` (a time.monotonic() value) the request gives up
+        rather than wait, time out or back off past it, and raises
+        DeadlineExceeded. Cut requests count as 'api_deadline_cut', not as
+        failures.
+        """
+        url = f"{self.algolia_base}/{endpoint}"
+        key = cache_key(url, params)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count('cache_hits')
+                return cached
+
+        error = None
+        for attempt in range(MAX_RETRIES + 1):
+            if deadline_at is not None and time.monotonic() >= deadline_at:
+                self._count('api_deadline_cut')
+                raise DeadlineExceeded(endpoint)
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                print(f"  [WARN] Skipping {endpoint}: {e}")
+                self._count('api_circuit_open')
+                return None
+
+            timeout = REQUEST_TIMEOUT
+            if deadline_at is not None:
+                waited = self.limiter.acquire(deadline_at)
+                timeout = min(timeout, deadline_at - time.monotonic())
+                if waited is None or timeout <= 0:
+                    self.breaker.cancel_call()
+                    self._count('api_deadline_cut')
+                    raise DeadlineExceeded(endpoint)
+            else:
+                self.limiter.acquire()
+            retry_after = None
+            start = time.monotonic()
+            try:
+                resp = self.session.get(url, params=params, timeout=timeout)
+            except requests.RequestException as e:
+                if deadline_at is not None and time.monotonic() >= deadline_at:
+                    self.breaker.cancel_call()  # cut short by the deadline, not a failure
+                    self._count('api_deadline_cut')
+                    raise DeadlineExceeded(endpoint)
+                error = e
+                self.limiter.record_error()
+                self.breaker.record_failure()
+            else:
+                if resp.status_code in RETRY_STATUSES:
+                    error = f"HTTP {resp.status_code}"
+                    retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+                    if resp.status_code in THROTTLE_STATUSES:
+                        self._count('api_throttled')
+                        self.limiter.record_throttle(retry_after)
+                    else:
+                        self.limiter.record_error()
+                    if resp.status_code == 429:
+                        self.breaker.record_success()  # reachable, just busy
+                    else:
+                        self.breaker.record_failure()
+                else:
+                    self.limiter.record_success(time.monotonic() - start)
+                    self.breaker.record_success()
+                    try:
+                        resp.raise_for_status()
+                        data = resp.json()
+                    except (requests.RequestException, ValueError) as e:
+                        # 4xx / bad payload: retrying will not help
+                        print(f"  [WARN] API error on {endpoint}: {e}")
+                        self._count('api_errors')
+                        return None
+                    self._count('api_calls')
+                    if self.cache:
+                        self.cache.set(key, data, self._response_ttl(params, data))
+                    return data
+
+            if attempt < MAX_RETRIES:
+                delay = max(backoff_delay(attempt), retry_after or 0)
+                if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+                    self._count('api_deadline_cut')
+                    raise DeadlineExceeded(endpoint)
+                self._count('api_retries')
+                time.sleep(delay)
+
+        print(f"  [WARN] API error on {endpoint}: {error}")
+        self._count('api_errors')
+        return None
+
+    @staticmethod
+    def _split_window(since_ts, until_ts):
+        """Split (since, until] at the UTC midnight closest to its middle, or
+        at the middle itself — aligned boundaries keep shard queries (and
+        their cache keys) stable from one run to the next."""
+        mid = (since_ts + until_ts) // 2
+        day = 86400
+        midnights = range((since_ts // day + 1) * day, until_ts, day)
+        if midnights:
+            mid = min(midnights, key=lambda t: abs(t - mid))
+        return (since_ts, mid), (mid, until_ts)
+
+    def _paginate_sharded(self, endpoint, params, since_ts, until_ts=None):
+        """All hits in (since_ts, until_ts], complete despite Algolia's hit cap.
 
-        return all_hits
+        Each window is probed with its first page; windows reporting more
+        than ALGOLIA_HIT_CAP hits are bisected, the others have their
+        remaining pages fetched. Windows and pages run concurrently on
+        SHARD_WORKERS threads. Hits are deduped by objectID and returned
+        newest first, like search_by_date.
+
+        Queries use the window widened to SHARD_GRID boundaries, so they
+        (and their cache keys) repeat from run to run; hits outside
+        (since_ts, until_ts] are dropped afterwards. A window or page whose
+        request fails is counted and reported — its hits are missing.
+        """
+        until_ts = int(time.time()) if until_ts is None else until_ts
+        base_filters = params.get('numericFilters', '')
+        grid = (since_ts // SHARD_GRID * SHARD_GRID, -(-until_ts // SHARD_GRID) * SHARD_GRID)
+
+        def fetch(window, page):
+            p = dict(params)
+            p['numericFilters'] = ','.join(filter(None, [
+                self._time_filter(*window), base_filters]))
+            p['hitsPerPage'] = HITS_PER_PAGE
+            p['page'] = page
+            return window, page, self._api_get(endpoint, p)
+
+        hits_by_id = {}
+        shards = 0
+        with ThreadPoolExecutor(max_workers=self.shard_workers) as pool:
+            pending = {pool.submit(fetch, grid, 0)}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    window, page, data = future.result()
+                    if not data:
+                        self._count('shard_windows_failed' if page == 0 else 'shard_pages_failed')
+                        print(f"  [WARN] {endpoint} window {window[0]}–{window[1]} "
+                              f"page {page} failed; its hits are missing")
+                        continue
+                    if page == 0:
+                        if data.get('nbHits', 0) > ALGOLIA_HIT_CAP and window[1] - window[0] > 1:
+                            self._count('shard_splits')
+                            for half in self._split_window(*window):
+                                pending.add(pool.submit(fetch, half, 0))
+                            continue
+                        shards += 1
+                        for next_page in range(1, data.get('nbPages', 0)):
+                            pending.add(pool.submit(fetch, window, next_page))
+                    for hit in data.get('hits', []):
+                        if since_ts < hit.get('created_at_i', 0) <= until_ts:
+                            hits_by_id[hit.get('objectID')] = hit
+            self._count('shards', shards)
+
+        return sorted(hits_by_id.values(),
+                      key=lambda h: (h.get('created_at_i', 0), str(h.get('objectID'))),
+                      reverse=True)
+
+    @staticmethod
+    def _source_windows(since_ts, until_ts, days=SOURCE_WINDOW_DAYS):
+        """(since, until] cut at multiples of `days` days, newest window first."""
+        span = days * 86400
+        hi = until_ts
+        while hi > since_ts:
+            lo = max(since_ts, (hi - 1) // span * span)
+            yield lo, hi
+            hi = lo
+
+    def iter_hits(self, endpoint, params, since_ts, until_ts=None):
+        """Stream of _paginate_sharded hits, newest first, one window at a time.
+
+        The next SOURCE_PREFETCH windows are fetched while the consumer works
+        through the current one; fetching stalls when it gets that far
+        ahead, so memory is bounded by the busiest few windows rather than
+        the whole lookback.
+        """
+        until_ts = int(time.time()) if until_ts is None else until_ts
+        ahead = deque()
+        with ThreadPoolExecutor(max_workers=SOURCE_PREFETCH) as pool:
+            for window in self._source_windows(since_ts, until_ts):
+                ahead.append(pool.submit(self._paginate_sharded, endpoint, params, *window))
+                if len(ahead) > SOURCE_PREFETCH:
+                    yield from ahead.popleft().result()
+            while ahead:
+                yield from ahead.popleft().result()
 
     # ── Collectors ─────────────────────────────────────────────────────
 
-    def collect_show_hn(self):
+    @staticmethod
+    def _time_filter(since_ts, until_ts=None):
+        f = f'created_at_i>{since_ts}'
+        if until_ts is not None:
+            f += f',created_at_i<={until_ts}'
+        return f
+
+    def iter_show_hn(self, since_ts=None, until_ts=None):
+        since_ts = self.cutoff_ts if since_ts is None else since_ts
+        for hit in self.iter_hits("search_by_date", {
+            'tags': 'show_hn',
+            'numericFilters': f'points>{MIN_POINTS_SHOW_HN}',
+        }, since_ts, until_ts):
+            self._count('show_hn_collected')
+            yield hit
+
+    def iter_threads(self, since_ts=None, until_ts=None):
+        since_ts = self.cutoff_ts if since_ts is None else since_ts
+        for hit in self.iter_hits("search_by_date", {
+            'tags': 'story',
+            'numericFilters': (
+                f'num_comments>{MIN_COMMENTS_THREAD},'
+                f'points>{MIN_POINTS_THREAD}'
+            ),
+        }, since_ts, until_ts):
+            # exclude Show HN (collected separately)
+            if 'show_hn' in hit.get('_tags', []):
+                continue
+            self._count('threads_collected')
+            yield hit
+
+    def collect_show_hn(self, since_ts=None, until_ts=None):
         print(f"\n{'─'*60}")
         print(f"  Show HN posts  (last {self.lookback_days}d, ≥{MIN_POINTS_SHOW_HN} pts)")
         print(f"{'─'*60}")
-        hits = self._paginate("search_by_date", {
-            'tags': 'show_hn',
-            'numericFilters': f'created_at_i>{self.cutoff_ts},points>{MIN_POINTS_SHOW_HN}',
-        })
-        self.stats['show_hn_collected'] = len(hits)
+        self.stats['show_hn_collected'] = 0
+        hits = list(self.iter_show_hn(since_ts, until_ts))
         print(f"  → {len(hits)} Show HN posts")
         return hits
 
-    def collect_threads(self):
+    def collect_threads(self, since_ts=None, until_ts=None):
         print(f"\n{'─'*60}")
         print(f"  High-engagement threads  (last {self.lookback_days}d, "
               f"≥{MIN_COMMENTS_THREAD} comments, ≥{MIN_POINTS_THREAD} pts)")
         print(f"{'─'*60}")
-        hits = self._paginate("search_by_date", {
-            'tags': 'story',
-            'numericFilters': (
-                f'created_at_i>{self.cutoff_ts},'
-                f'num_comments>{MIN_COMMENTS_THREAD},'
-                f'points>{MIN_POINTS_THREAD}'
-            ),
-        })
-        # exclude Show HN (collected separately)
-        hits = [h for h in hits if 'show_hn' not in h.get('_tags', [])]
-        self.stats['threads_collected'] = len(hits)
+        self.stats['threads_collected'] = 0
+        hits = list(self.iter_threads(since_ts, until_ts))
         print(f"  → {len(hits)} threads (excl. Show HN)")
         return hits
 
+    # ── Incremental collection ─────────────────────────────────────────
+
+    def _incremental_plan(self, previous):
+        """Split work against the previous snapshot.
+
+        Posts newer than the previous run are collected in full. Posts from
+        the last ENGAGEMENT_WINDOW_DAYS before it are re-polled only to
+        refresh points / comment counts; older signals are carried over.
+        Returns (since_ts, prev_signals_by_id, carried) or None when the
+        snapshot is unusable and a full run is needed.
+        """
+        try:
+            watermark = int(datetime.fromisoformat(
+                previous['meta']['collected_at']).timestamp())
+        except (KeyError, TypeError, ValueError):
+            return None
+        if watermark <= self.cutoff_ts:
+            return None
+        if previous['meta'].get('partial'):
+            return None  # posts it missed would fall behind the watermark
+
+        since_ts = max(self.cutoff_ts, watermark - ENGAGEMENT_WINDOW_DAYS * 86400)
+        prev_by_id, carried = {}, []
+        for sig in previous.get('signals', []):
+            ts = sig.get('created_at_ts', 0)
+            if ts <= self.cutoff_ts:
+                continue  # fell out of the lookback window
+            if ts > since_ts:
+                prev_by_id[sig['hn_id']] = sig
+            else:
+                carried.append(sig)
+        return since_ts, prev_by_id, carried
+
+    def _split_refreshable(self, hits, prev_by_id):
+        """Refresh hits already in the previous snapshot; return the new ones."""
+        new_posts, refreshed = [], []
+        for post in hits:
+            prev = prev_by_id.pop(post.get('objectID'), None)
+            # re-build a known post only if it now earns a comment fetch it never had
+            if prev is None or (not prev['top_comments'] and self._should_fetch_comments(post)):
+                new_posts.append(post)
+                continue
+            sig = dict(prev)
+            sig['points'] = post.get('points', 0)
+            sig['num_comments'] = post.get('num_comments', 0)
+            refreshed.append(sig)
+        return new_posts, refreshed
+
     # ── Comment fetching ───────────────────────────────────────────────
 
-    def fetch_comments(self, story_id):
+    def fetch_comments(self, story_id, deadline_at=None):
         data = self._api_get("search", {
             'tags': f'comment,story_{story_id}',
             'hitsPerPage': MAX_COMMENTS_PER_POST,
-        })
+        }, deadline_at)
         if not data:
             return []
         return data.get('hits', [])
 
+    def fetch_comments_batch(self, story_ids, deadline_at=None):
+        """Comments for many stories from one OR-tag query: {story_id: hits}.
+
+        Pages through `comment,(story_a,story_b,…)` and regroups hits by
+        story, keeping Algolia's order and MAX_COMMENTS_PER_POST per story.
+        A group whose total exceeds the reachable hit window is split in two.
+        """
+        story_ids = [str(i) for i in story_ids]
+        grouped = {i: [] for i in story_ids}
+        params = {
+            'tags': f"comment,({','.join(f'story_{i}' for i in story_ids)})",
+            'hitsPerPage': COMMENT_BATCH_HIT_BUDGET,
+        }
+        page = 0
+        while True:
+            params['page'] = page
+            data = self._api_get("search", params, deadline_at)
+            if not data:
+                break
+            if page == 0 and len(story_ids) > 1 and \
+                    data.get('nbHits', 0) > COMMENT_BATCH_HIT_BUDGET:
+                mid = len(story_ids) // 2
+                grouped = self.fetch_comments_batch(story_ids[:mid], deadline_at)
+                grouped.update(self.fetch_comments_batch(story_ids[mid:], deadline_at))
+                return grouped
+            for hit in data.get('hits', []):
+                bucket = grouped.get(str(hit.get('story_id')))
+                if bucket is not None and len(bucket) < MAX_COMMENTS_PER_POST:
+                    bucket.append(hit)
+            page += 1
+            if page >= data.get('nbPages', 0):
+                break
+        self._count('comment_batches')
+        return grouped
+
     def _should_fetch_comments(self, post):
         return (post.get('points', 0) >= COMMENT_FETCH_MIN_POINTS
                 or post.get('num_comments', 0) >= COMMENT_FETCH_MIN_COMMENTS)
 
+    def _batchable(self, post):
+        return (self.batch_comments
+                and post.get('num_comments', 0) <= COMMENT_BATCH_MAX_STORY_COMMENTS)
+
+    def _with_comments(self, jobs):
+        """Yield (post, post_type, comments) for each (post, post_type) job.
+
+        Comment fetches run ahead on a bounded worker pool (all behind the
+        shared rate limiter) while the caller consumes results in input
+        order, so output stays deterministic. At most PIPELINE_DEPTH posts
+        are buffered. With batch_comments, small threads are grouped into
+        fetch_comments_batch units as they enter the window. Worker
+        occupancy is recorded in self.stats.
+        """
+        busy = [0.0]
+        busy_lock = threading.Lock()
+
+        def fetch(story_ids, batched):
+            start = time.monotonic()
+            try:
+                if batched:
+                    return self.fetch_comments_batch(story_ids)
+                return {story_ids[0]: self.fetch_comments(story_ids[0])}
+            finally:
+                with busy_lock:
+                    busy[0] += time.monotonic() - start
+
+        def submit(unit):
+            if unit['future'] is None:
+                # a submitted batch is closed: later posts start a new one
+                if open_batch[0] is unit:
+                    open_batch[0] = None
+                unit['future'] = pool.submit(fetch, list(unit['ids']), unit['batched'])
+
+        depth = PIPELINE_DEPTH
+        if self.batch_comments:
+            depth = max(depth, 2 * COMMENT_BATCH_MAX_STORIES)
+        started = time.monotonic()
+        jobs = iter(jobs)
+        window = deque()
+        open_batch = [None]
+        with ThreadPoolExecutor(max_workers=self.comment_workers) as pool:
+            def submit_next():
+                job = next(jobs, None)
+                if job is None:
+                    return
+                post, post_type = job
+                unit = None
+                if self._should_fetch_comments(post):
+                    self._count('comment_fetches')
+                    story_id = str(post['objectID'])
+                    if self._batchable(post):
+                        unit = open_batch[0]
+                        n = post.get('num_comments', 0)
+                        if unit is None or unit['future'] is not None \
+                                or len(unit['ids']) >= COMMENT_BATCH_MAX_STORIES \
+                                or unit['hits'] + n > COMMENT_BATCH_HIT_BUDGET:
+                            if unit is not None:
+                                submit(unit)
+                            unit = open_batch[0] = {'ids': [], 'hits': 0,
+                                                    'batched': True, 'future': None}
+                        unit['ids'].append(story_id)
+                        unit['hits'] += n
+                    else:
+                        unit = {'ids': [story_id], 'batched': False, 'future': None}
+                        submit(unit)
+                window.append((post, post_type, unit))
+
+            for _ in range(depth):
+                submit_next()
+            while window:
+                post, post_type, unit = window.popleft()
+                submit_next()
+                comments = None
+                if unit is not None:
+                    submit(unit)  # an open batch is flushed once it is needed
+                    comments = unit['future'].result().get(str(post['objectID']), [])
+                yield post, post_type, comments
+
+        wall = time.monotonic() - started
+        self.stats['pipeline_workers'] = self.comment_workers
+        self.stats['pipeline_wall_s'] = round(wall, 2)
+        self.stats['pipeline_occupancy'] = round(
+            busy[0] / (self.comment_workers * wall), 3) if wall else 0.0
+
     # ── Extraction helpers ─────────────────────────────────────────────
 
     @staticmethod
@@ -225,31 +975,51 @@ class HNCollector:
         return links
 
     @staticmethod
-    def classify_intent(title, text):
+    def scan_text(title, text):
+        """One pass over title + text → intent and monetisation hits."""
         combined = f"{title or ''} {text or ''}".lower()
-        b = sum(1 for p in BUILDER_PATTERNS if re.search(p, combined))
-        e = sum(1 for p in EXPERIMENTER_PATTERNS if re.search(p, combined))
+        hits = INTENT_SCANNER.scan(combined)
+        b, e = len(hits['builder']), len(hits['experimenter'])
         if b >= 2 or (b == 1 and e == 0):
-            return 'builder'
-        if e >= 1:
-            return 'experimenter'
-        return 'discussion'
+            intent = 'builder'
+        elif e >= 1:
+            intent = 'experimenter'
+        else:
+            intent = 'discussion'
+        return {
+            'author_intent': intent,
+            'has_monetisation_language': len(hits['monetise']) > 0,
+            'monetisation_hits': hits['monetise'],
+        }
 
-    @staticmethod
-    def detect_monetisation(title, text):
-        combined = f"{title or ''} {text or ''}".lower()
-        hits = [p for p in MONETISE_PATTERNS if re.search(p, combined)]
-        return len(hits) > 0, hits
+    @classmethod
+    def classify_intent(cls, title, text):
+        return cls.scan_text(title, text)['author_intent']
+
+    @classmethod
+    def detect_monetisation(cls, title, text):
+        result = cls.scan_text(title, text)
+        return result['has_monetisation_language'], result['monetisation_hits']
+
+    @classmethod
+    def classify_many(cls, posts):
+        """scan_text for a batch of raw Algolia posts, in order."""
+        return [
+            cls.scan_text(p.get('title', ''),
+                          strip_html(p.get('story_text') or p.get('text') or ''))
+            for p in posts
+        ]
 
     # ── Signal builder ─────────────────────────────────────────────────
 
-    def build_signal(self, post, post_type, comments=None):
+    @classmethod
+    def build_signal(cls, post, post_type, comments=None):
         title = post.get('title', '')
         body = strip_html(post.get('story_text') or post.get('text') or '')
         url = post.get('url', '')
 
         # Links from post
-        all_links = self.extract_links(f"{body} {url}")
+        all_links = cls.extract_links(f"{body} {url}")
 
         # Links + text from comments
         comment_objs = []
@@ -257,7 +1027,7 @@ class HNCollector:
             for c in comments[:MAX_COMMENTS_PER_POST]:
                 c_text = strip_html(c.get('comment_text') or c.get('text') or '')
                 if c_text:
-                    c_links = self.extract_links(c_text)
+                    c_links = cls.extract_links(c_text)
                     for k in all_links:
                         all_links[k].extend(c_links.get(k, []))
                     comment_objs.append({
@@ -269,8 +1039,9 @@ class HNCollector:
             for k in all_links:
                 all_links[k] = list(dict.fromkeys(all_links[k]))
 
-        intent = self.classify_intent(title, body)
-        has_monetisation, monetise_hits = self.detect_monetisation(title, body)
+        scan = cls.scan_text(title, body)
+        intent = scan['author_intent']
+        has_monetisation = scan['has_monetisation_language']
 
         return {
             'id': f"hn_{post.get('objectID', '?')}",
@@ -295,99 +1066,347 @@ class HNCollector:
             'top_comments': comment_objs,
         }
 
+    def build_signals(self, show_hn, threads):
+        """Fetch comments and build signals for collected posts, in input order."""
+        return list(self.iter_signals(show_hn, threads))
+
+    def iter_signals(self, show_hn, threads, comments=None):
+        """Like build_signals, but yields each signal as soon as it is built.
+
+        `show_hn` and `threads` may be lists or lazy streams (iter_show_hn,
+        iter_threads); posts are pulled only as the comment pipeline has
+        room for them. With `comments` ({story_id: hits}, e.g. from a
+        CommentScheduler) nothing is fetched; other posts get no comments.
+        With build_workers > 1, signals are built by parallel_build.
+        """
+        totals = {'show_hn': f"/{len(show_hn)}" if hasattr(show_hn, '__len__') else '',
+                  'technical_thread': f"/{len(threads)}" if hasattr(threads, '__len__') else ''}
+        jobs = itertools.chain(((post, 'show_hn') for post in show_hn),
+                               ((post, 'technical_thread') for post in threads))
+        if comments is None:
+            enriched = self._with_comments(jobs)
+        else:
+            enriched = ((post, post_type, comments.get(str(post['objectID'])))
+                        for post, post_type in jobs)
+        done = defaultdict(int)
+        for signal in parallel_build(enriched, self.build_workers, stats=self.stats):
+            yield signal
+            post_type = signal['type']
+            done[post_type] += 1
+            if post_type == 'show_hn' and done[post_type] % 50 == 0:
+                print(f"    {done[post_type]}{totals[post_type]} Show HN processed")
+            elif post_type == 'technical_thread' and done[post_type] % 100 == 0:
+                print(f"    {done[post_type]}{totals[post_type]} threads processed")
+
+        print(f"    ✓ {done['show_hn']} Show HN processed")
+        print(f"    ✓ {done['technical_thread']} threads processed")
+        if self.stats.get('build_workers'):
+            print(f"    build: {self.stats['build_workers']} processes, "
+                  f"{self.stats['build_chunk']} posts per chunk")
+        if comments is None:
+            print(f"    pipeline: {self.comment_workers} workers, "
+                  f"{self.stats['pipeline_occupancy']:.0%} occupied")
+
+    @staticmethod
+    def sort_signals(signals):
+        """Builders first, then GitHub, monetisation language and points."""
+        signals.sort(key=signal_sort_key, reverse=True)
+        return signals
+
     # ── Main pipeline ──────────────────────────────────────────────────
 
-    def run(self):
+    def run(self, incremental=False, sort=True):
+        """Collect, build and write one snapshot; returns (dated, latest) paths.
+
+        Streaming formats (jsonl, packed) write each signal as soon as it
+        is built; with `sort` they are ordered by an external merge pass
+        instead of in memory. The classic json format is sorted in memory.
+        """
+        started = time.monotonic()
         ts = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
         os.makedirs(f"{self.output_dir}/raw", exist_ok=True)
+        dated = f"{self.output_dir}/raw/hn_signals_{ts}{self.output_ext}"
+        latest = f"{self.output_dir}/raw/hn_signals_latest{self.output_ext}"
+
+        plan = previous = None
+        if incremental and os.path.exists(latest):
+            previous = load_snapshot(latest)
+            plan = self._incremental_plan(previous)
+            if plan is None:
+                print("  [WARN] Previous snapshot unusable, running a full collection")
 
         # 1. Collect
-        show_hn = self.collect_show_hn()
-        threads = self.collect_threads()
+        reused = []
+        if plan:
+            since_ts, prev_by_id, carried = plan
+            plan_from = previous['meta']['collected_at']
+            print(f"\n  Incremental run since {plan_from} "
+                  f"(re-polling from {datetime.fromtimestamp(since_ts, tz=timezone.utc).isoformat()})")
+            show_hn, refreshed_show = self._split_refreshable(
+                self.collect_show_hn(since_ts), prev_by_id)
+            threads, refreshed_threads = self._split_refreshable(
+                self.collect_threads(since_ts), prev_by_id)
+            # anything left in prev_by_id was not returned again — keep as-is
+            kept = carried + list(prev_by_id.values())
+            reused = kept + refreshed_show + refreshed_threads
+            self.stats['signals_carried'] = len(kept)
+            self.stats['signals_refreshed'] = len(refreshed_show) + len(refreshed_threads)
+        else:
+            # lazy: posts are paged in only as fast as signals are built
+            show_hn = self.iter_show_hn()
+            threads = self.iter_threads()
 
         # 2. Build signals
         print(f"\n{'─'*60}")
-        print("  Building signals …")
+        print(f"  Building signals …  (last {self.lookback_days}d: Show HN ≥{MIN_POINTS_SHOW_HN} pts, "
+              f"threads ≥{MIN_COMMENTS_THREAD} comments)")
         print(f"{'─'*60}")
 
-        signals = []
-
-        for i, post in enumerate(show_hn):
-            comments = None
-            if self._should_fetch_comments(post):
-                comments = self.fetch_comments(post['objectID'])
-                self.stats['comment_fetches'] += 1
-            signals.append(self.build_signal(post, 'show_hn', comments))
-            if (i + 1) % 50 == 0:
-                print(f"    {i+1}/{len(show_hn)} Show HN processed")
-
-        print(f"    ✓ {len(show_hn)} Show HN processed")
+        comments = None
+        if self.comment_budget is not None or self.deadline is not None:
+            # ranking needs every post up front (metadata only; comments stay bounded)
+            show_hn, threads = list(show_hn), list(threads)
+            jobs = [(p, 'show_hn') for p in show_hn] + [(p, 'technical_thread') for p in threads]
+            deadline_at = None
+            if self.deadline is not None:
+                deadline_at = started + self.deadline - DEADLINE_BUILD_RESERVE * len(jobs)
+            comments = CommentScheduler(self, self.comment_budget, deadline_at).run(jobs)
+            print(f"  Comment scheduler: {len(comments)} fetched, "
+                  f"{self.stats['comments_over_budget']} over budget, "
+                  f"{self.stats['comments_cut_by_deadline']} cut by deadline")
 
-        for i, post in enumerate(threads):
-            comments = None
-            if self._should_fetch_comments(post):
-                comments = self.fetch_comments(post['objectID'])
-                self.stats['comment_fetches'] += 1
-            signals.append(self.build_signal(post, 'technical_thread', comments))
-            if (i + 1) % 100 == 0:
-                print(f"    {i+1}/{len(threads)} threads processed")
-
-        print(f"    ✓ {len(threads)} threads processed")
+        signals = itertools.chain(reused, self.iter_signals(show_hn, threads, comments))
 
         # 3. Sort: builders first, then points
-        signals.sort(key=lambda s: (
-            s['builder_present'],
-            s['has_github'],
-            s['has_monetisation_language'],
-            s['points'],
-        ), reverse=True)
-
-        # 4. Write output
-        output = {
-            'meta': {
-                'collected_at': datetime.now(timezone.utc).isoformat(),
-                'lookback_days': self.lookback_days,
-                'cutoff_date': datetime.fromtimestamp(
-                    self.cutoff_ts, tz=timezone.utc
-                ).isoformat(),
-                'total_signals': len(signals),
-                'stats': dict(self.stats),
-            },
-            'signals': signals,
-        }
-
-        dated = f"{self.output_dir}/raw/hn_signals_{ts}.json"
-        latest = f"{self.output_dir}/raw/hn_signals_latest.json"
+        if sort and self.output_ext == OUTPUT_FORMATS['json']:
+            signals = self.sort_signals(list(signals))
+        elif sort:
+            signals = external_sort(signals)
 
-        for path in (dated, latest):
-            with open(path, 'w') as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
+        # 4. Write output as it streams past, then publish `latest`
+        summary = defaultdict(int)
+        writer = open_snapshot_writer(dated)
+        for sig in signals:
+            writer.write(sig)
+            summary['total'] += 1
+            summary['builders'] += sig['author_intent'] == 'builder'
+            summary['with_gh'] += sig['has_github']
+            summary['with_demo'] += sig['has_demo']
+            summary['with_mon'] += sig['has_monetisation_language']
+        meta = {
+            'collected_at': datetime.now(timezone.utc).isoformat(),
+            'lookback_days': self.lookback_days,
+            'cutoff_date': datetime.fromtimestamp(
+                self.cutoff_ts, tz=timezone.utc
+            ).isoformat(),
+            'total_signals': summary['total'],
+            # failed requests mean missing pages or comments, not empty results
+            'partial': self.failed_requests() > 0,
+            'stats': dict(self.stats),
+        }
+        if plan:
+            meta['incremental_from'] = plan_from
+        writer.close(meta)
+        publish_latest(dated, latest)
 
         # 5. Summary
-        builders = sum(1 for s in signals if s['author_intent'] == 'builder')
-        with_gh  = sum(1 for s in signals if s['has_github'])
-        with_demo = sum(1 for s in signals if s['has_demo'])
-        with_mon = sum(1 for s in signals if s['has_monetisation_language'])
-
         print(f"\n{'═'*60}")
         print("  COLLECTION COMPLETE")
         print(f"{'═'*60}")
-        print(f"  Total signals:        {len(signals)}")
+        print(f"  Total signals:        {summary['total']}")
         print(f"  Show HN:              {self.stats['show_hn_collected']}")
         print(f"  Threads:              {self.stats['threads_collected']}")
-        print(f"  Builder intent:       {builders}")
-        print(f"  With GitHub link:     {with_gh}")
-        print(f"  With demo:            {with_demo}")
-        print(f"  With monetisation:    {with_mon}")
+        if plan:
+            print(f"  Refreshed / carried:  {self.stats['signals_refreshed']}"
+                  f" / {self.stats['signals_carried']}")
+        print(f"  Builder intent:       {summary['builders']}")
+        print(f"  With GitHub link:     {summary['with_gh']}")
+        print(f"  With demo:            {summary['with_demo']}")
+        print(f"  With monetisation:    {summary['with_mon']}")
         print(f"  API calls:            {self.stats['api_calls']}")
+        print(f"  Cache hits:           {self.stats['cache_hits']}")
+        if meta['partial']:
+            print(f"  [WARN] Partial:       {self.failed_requests()} requests failed "
+                  f"({self.stats['api_circuit_open']} refused by the circuit breaker)")
         print(f"  Output:               {dated}")
         print(f"{'═'*60}")
 
         return dated, latest
 
 
+# ── Comment scheduling ─────────────────────────────────────────────────────
+
+class CommentScheduler:
+    """Spend a comment-request budget on the most valuable posts first.
+
+    Posts are ranked by expected signal value: builder intent, a GitHub
+    link, points velocity and thread size. Fetches run in that order on the
+    collector's worker pool until the request budget is spent or the fetch
+    deadline passes; fetches in flight then stop at the deadline instead of
+    retrying. Unfetched posts are built without comments, so a run always
+    finishes on time with the best enrichment done first.
+
+    The budget counts planned Algolia requests: one per story, or one per
+    group of small threads with batch_comments. Retries and the split of a
+    group that turns out larger than COMMENT_BATCH_HIT_BUDGET are not
+    charged to it.
+    """
+
+    def __init__(self, collector, budget=None, deadline_at=None, now=None):
+        self.collector = collector
+        self.budget = budget
+        self.deadline_at = deadline_at    # time.monotonic() value, or None
+        self.now = int(time.time()) if now is None else now
+
+    def value(self, post, post_type):
+        title = post.get('title', '')
+        body = post.get('story_text') or post.get('text') or ''
+        intent = self.collector.scan_text(title, body)['author_intent']
+        age_hours = max(1.0, (self.now - post.get('created_at_i', self.now)) / 3600)
+        value = SCHEDULER_WEIGHTS[intent]
+        if 'github.com/' in f"{post.get('url') or ''} {body}":
+            value += SCHEDULER_WEIGHTS['github']
+        if post_type == 'show_hn':
+            value += SCHEDULER_WEIGHTS['show_hn']
+        value += SCHEDULER_WEIGHTS['velocity'] * math.log1p(post.get('points', 0) / age_hours)
+        value += SCHEDULER_WEIGHTS['discussion_size'] * math.log1p(post.get('num_comments', 0))
+        return value
+
+    def plan(self, jobs):
+        """Fetch units worth a request, most valuable first, cut to the budget.
+
+        A unit is one request: a single story or, with batch_comments, a
+        group of small threads for fetch_comments_batch. Posts join the
+        open group in value order, so they cost no extra request.
+        """
+        ranked = sorted(
+            ((self.value(post, post_type), post)
+             for post, post_type in jobs if post.get('num_comments', 0) > 0),
+            key=lambda vp: vp[0], reverse=True)
+        self.collector._count('comments_candidates', len(ranked))
+        units, open_batch, over = [], None, 0
+        for _, post in ranked:
+            story_id = str(post['objectID'])
+            n = post.get('num_comments', 0)
+            batchable = self.collector._batchable(post)
+            if batchable and open_batch is not None \
+                    and len(open_batch['ids']) < COMMENT_BATCH_MAX_STORIES \
+                    and open_batch['hits'] + n <= COMMENT_BATCH_HIT_BUDGET:
+                open_batch['ids'].append(story_id)
+                open_batch['hits'] += n
+                continue
+            if self.budget is not None and len(units) >= self.budget:
+                over += 1
+                continue
+            unit = {'ids': [story_id], 'hits': n, 'batched': batchable}
+            units.append(unit)
+            if batchable:
+                open_batch = unit
+        self.collector._count('comments_over_budget', over)
+        return units
+
+    def _fetch(self, unit):
+        if unit['batched'] and len(unit['ids']) > 1:
+            return self.collector.fetch_comments_batch(unit['ids'], self.deadline_at)
+        story_id = unit['ids'][0]
+        return {story_id: self.collector.fetch_comments(story_id, self.deadline_at)}
+
+    def run(self, jobs):
+        """Fetch comments in priority order: {story_id: hits}.
+
+        Fetches get the deadline too, so whatever is in flight when it
+        passes gives up (DeadlineExceeded) instead of retrying; run() waits
+        for those and counts their posts as cut.
+        """
+        units = self.plan(jobs)
+        results = {}
+        workers = self.collector.comment_workers
+        pending = {}
+        queue = deque(units)
+        cut = []
+        requests_done = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while queue or pending:
+                remaining = None
+                if self.deadline_at is not None:
+                    remaining = self.deadline_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                # keep just enough in flight that the deadline leaves little stranded
+                while queue and len(pending) < workers:
+                    unit = queue.popleft()
+                    pending[pool.submit(self._fetch, unit)] = unit
+                if not pending:
+                    break
+                finished, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    unit = pending.pop(future)
+                    try:
+                        results.update(future.result())
+                    except DeadlineExceeded:
+                        cut.append(unit)
+                        continue
+                    requests_done += 1
+            # in-flight fetches give up at the deadline; the pool waits for them
+        cut.extend(itertools.chain(queue, pending.values()))
+        self.collector._count('comment_fetches', len(results))
+        self.collector._count('comment_requests', requests_done)
+        self.collector._count('comments_cut_by_deadline', sum(len(u['ids']) for u in cut))
+        return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Collect HN signals.")
+    parser.add_argument('lookback_days', nargs='?', type=int, default=30)
+    parser.add_argument('output_dir', nargs='?', default='hn_signals')
+    parser.add_argument('--incremental', action='store_true',
+                        help="only collect posts newer than the latest snapshot and "
+                             "refresh engagement for recent ones")
+    parser.add_argument('--comment-workers', type=int, default=COMMENT_WORKERS,
+                        help="concurrent comment fetches (default: %(default)s)")
+    parser.add_argument('--batch-comments', action='store_true',
+                        help="fetch comments for many small threads per Algolia query")
+    parser.add_argument('--comment-budget', type=int, default=None, metavar='N',
+                        help="at most N comment requests, spent on the most valuable posts first")
+    parser.add_argument('--deadline', type=float, default=None, metavar='SECONDS',
+                        help="finish within this many seconds; comment fetching stops in time")
+    parser.add_argument('--build-workers', type=int, default=BUILD_WORKERS, metavar='N',
+                        help="build signals in N worker processes (large backfills; "
+                             f"runs under {BUILD_POOL_MIN_POSTS} posts stay in-process)")
+    parser.add_argument('--format', choices=sorted(OUTPUT_FORMATS), default='json',
+                        help="snapshot file format; 'jsonl' streams one signal per line, "
+                             "'packed' writes compressed, indexed .hnpk files (see hn_pack.py)")
+    parser.add_argument('--no-sort', action='store_true',
+                        help="keep signals in collection order (jsonl/packed skip the "
+                             "external sort pass)")
+    parser.add_argument('--archive', nargs='?', const='', default=None, metavar='DIR',
+                        help="also add the run to the deduplicated snapshot archive "
+                             "(default: <output_dir>/archive)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always hit the API, bypassing the on-disk cache")
+    parser.add_argument('--algolia-base', default=None,
+                        help="Algolia API root (default: the real HN search API)")
+    parser.add_argument('--cache-path', default=None,
+                        help="response cache file (default: .hn_cache/responses.sqlite3)")
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-    days = int(sys.argv[1]) if len(sys.argv) > 1 else 30
-    out  = sys.argv[2] if len(sys.argv) > 2 else 'hn_signals'
-    collector = HNCollector(lookback_days=days, output_dir=out)
-    collector.run()
+    args = parse_args()
+    cache = None
+    if args.cache_path and not args.no_cache:
+        cache = ResponseCache(args.cache_path)
+    collector = HNCollector(lookback_days=args.lookback_days, output_dir=args.output_dir,
+                            cache=cache, use_cache=not args.no_cache,
+                            comment_workers=args.comment_workers,
+                            batch_comments=args.batch_comments,
+                            output_format=args.format,
+                            comment_budget=args.comment_budget, deadline=args.deadline,
+                            build_workers=args.build_workers,
+                            algolia_base=args.algolia_base)
+    dated, latest = collector.run(incremental=args.incremental, sort=not args.no_sort)
+    if args.archive is not None:
+        from hn_archive import SignalArchive
+        archive = SignalArchive(args.archive or os.path.join(args.output_dir, 'archive'))
+        new, deltas = archive.add_snapshot_file(dated)
+        print(f"  Archived:             {new} new objects ({deltas} deltas)")
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+HN Signal Daemon
+================
+Long-running wrapper around HNSignalDetector for consumers that want
+signals within minutes of posting, rather than from a daily batch.
+
+  - follows HN with HNTailFollower (/maxitem + /updates), keeping one
+    detector, HTTP session and response cache warm across polls
+  - appends every signal to a JSONL stream and/or broadcasts it to the
+    clients of a local Unix socket
+  - re-scores tracked posts as their points and comments grow; each change
+    is emitted again as an 'update' event
+  - reports health and lag on GET /health (optional HTTP port) and/or in a
+    status file rewritten after every poll
+
+Stream records, one per line:
+  {"event": "new" | "update", "emitted_at": "...", "signal": {...HNSignal...}}
+
+Usage:
+  python3 hn_daemon.py --stream hn_signals/live.jsonl --health-port 8765
+  python3 hn_daemon.py --socket /tmp/hn_signals.sock --poll-interval 15
+  python3 hn_daemon.py --firebase-base http://127.0.0.1:8080/v0 --no-cache   # local fake
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hn_module import HNFetcher, HNSignalDetector, HNTailFollower
+from hn_ratelimit import backoff_delay
+
+STALE_AFTER_POLLS = 3   # health turns 'stale' after this many intervals without a good poll
+MAX_ERROR_BACKOFF = 300
+
+
+# ── Sinks ──────────────────────────────────────────────────────────────────
+
+class JsonlStream:
+    """Append-only JSONL file; each poll's records are flushed together."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._f = open(path, 'a', encoding='utf-8')
+
+    def emit(self, line):
+        self._f.write(line)
+
+    def flush(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self):
+        self._f.close()
+
+
+class SocketBroadcaster:
+    """Unix stream socket; every connected client receives every record."""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            os.remove(path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen()
+        self._clients = []
+        self._lock = threading.Lock()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return  # closed
+            client.settimeout(5)
+            with self._lock:
+                self._clients.append(client)
+
+    def emit(self, line):
+        data = line.encode('utf-8')
+        with self._lock:
+            for client in list(self._clients):
+                try:
+                    client.sendall(data)
+                except OSError:
+                    self._clients.remove(client)  # slow or gone: drop it
+                    client.close()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._server.close()
+        with self._lock:
+            for client in self._clients:
+                client.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# ── Daemon ─────────────────────────────────────────────────────────────────
+
+class SignalDaemon:
+    """Poll loop, sinks and health state."""
+
+    def __init__(self, follower, sinks, status_file=None):
+        self.follower = follower
+        self.sinks = sinks
+        self.status_file = status_file
+        self.started_at = time.time()
+        self.last_poll_at = None
+        self.last_success_at = None
+        self.last_error = None
+        self.consecutive_errors = 0
+        self.errors = 0
+        self.events = {'new': 0, 'update': 0}
+        self._published = {}  # hn_id → (score, num_comments) last emitted
+        self._stop = threading.Event()
+
+    def _event(self, sig):
+        """'new', 'update', or None when nothing changed since the last emit."""
+        state = (sig.score, sig.num_comments)
+        previous = self._published.get(sig.hn_id)
+        if previous == state:
+            return None
+        self._published[sig.hn_id] = state
+        return 'new' if previous is None else 'update'
+
+    def publish(self, signals):
+        now = datetime.now(timezone.utc).isoformat()
+        for sig in signals:
+            event = self._event(sig)
+            if event is None:
+                continue
+            self.events[event] += 1
+            line = json.dumps({'event': event, 'emitted_at': now, 'signal': sig.to_dict()},
+                              ensure_ascii=False, default=str) + '\n'
+            for sink in self.sinks:
+                sink.emit(line)
+        for sink in self.sinks:
+            sink.flush()
+        # forget stories the follower no longer tracks
+        for hn_id in [i for i in self._published if i not in self.follower.tracked]:
+            del self._published[hn_id]
+
+    def health(self):
+        now = time.time()
+        interval = self.follower.poll_interval
+        if self.last_success_at is None:
+            status = 'starting'
+        elif now - self.last_success_at > STALE_AFTER_POLLS * max(interval, 1):
+            status = 'stale'
+        else:
+            status = 'ok'
+        newest = self.follower.newest_item_time
+        return {
+            'status': status,
+            'uptime_s': round(now - self.started_at, 1),
+            'last_poll_age_s': None if self.last_poll_at is None else round(now - self.last_poll_at, 1),
+            'last_success_age_s': (None if self.last_success_at is None
+                                   else round(now - self.last_success_at, 1)),
+            'item_lag_s': None if newest is None else round(now - newest, 1),
+            'max_item': self.follower.last_max,
+            'tracked_stories': len(self.follower.tracked),
+            'events': dict(self.events),
+            'errors': self.errors,
+            'consecutive_errors': self.consecutive_errors,
+            'last_error': self.last_error,
+            'follower': dict(self.follower.stats),
+        }
+
+    def _write_status(self):
+        if not self.status_file:
+            return
+        tmp = f"{self.status_file}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.health(), f, indent=2)
+        os.replace(tmp, self.status_file)
+
+    def poll_once(self):
+        self.last_poll_at = time.time()
+        try:
+            signals = self.follower.poll()
+        except Exception as e:
+            # a long-running service: log any failure and try again next poll
+            self.errors += 1
+            self.consecutive_errors += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"  [WARN] poll failed ({self.consecutive_errors} in a row): {e}")
+            return False
+        self.consecutive_errors = 0
+        self.last_success_at = time.time()
+        self.publish(signals)
+        return True
+
+    def run(self, max_polls=None):
+        polls = 0
+        while not self._stop.is_set() and (max_polls is None or polls < max_polls):
+            started = time.monotonic()
+            ok = self.poll_once()
+            self._write_status()
+            polls += 1
+            wait = self.follower.poll_interval - (time.monotonic() - started)
+            if not ok:
+                wait = max(wait, min(MAX_ERROR_BACKOFF, backoff_delay(self.consecutive_errors)))
+            if max_polls is None or polls < max_polls:
+                self._stop.wait(max(0.0, wait))
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def serve_health(daemon, port, host='127.0.0.1'):
+    """GET /health → health JSON (503 unless status is 'ok'), on a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') != '/health':
+                self.send_error(404)
+                return
+            health = daemon.health()
+            body = json.dumps(health).encode('utf-8')
+            self.send_response(200 if health['status'] == 'ok' else 503)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Continuous HN signal detection.")
+    parser.add_argument('--stream', default=os.path.join('hn_signals', 'live.jsonl'),
+                        help="append-only JSONL output (default: %(default)s; '' to disable)")
+    parser.add_argument('--socket', help="also broadcast records on this Unix socket")
+    parser.add_argument('--poll-interval', type=float, default=HNTailFollower.POLL_INTERVAL)
+    parser.add_argument('--backlog', type=int, default=0,
+                        help="also process this many items before the current maxitem")
+    parser.add_argument('--min-score', type=int, default=10)
+    parser.add_argument('--min-technical-depth', type=int, default=3)
+    parser.add_argument('--no-rescore', action='store_true',
+                        help="emit each story once instead of following its growth")
+    parser.add_argument('--health-port', type=int, help="serve GET /health on this port")
+    parser.add_argument('--status-file', help="rewrite health JSON here after every poll")
+    parser.add_argument('--firebase-base', help="Firebase API root (default: the real HN API)")
+    parser.add_argument('--max-polls', type=int, help="exit after this many polls")
+    parser.add_argument('--no-cache', action='store_true')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fetcher = HNFetcher(use_cache=not args.no_cache, firebase_base=args.firebase_base)
+    follower = HNTailFollower(HNSignalDetector(fetcher=fetcher),
+                              poll_interval=args.poll_interval, backlog=args.backlog,
+                              min_score=args.min_score,
+                              min_technical_depth=args.min_technical_depth,
+                              rescore=not args.no_rescore)
+    sinks = []
+    if args.stream:
+        sinks.append(JsonlStream(args.stream))
+    if args.socket:
+        sinks.append(SocketBroadcaster(args.socket))
+    daemon = SignalDaemon(follower, sinks, status_file=args.status_file)
+    server = serve_health(daemon, args.health_port) if args.health_port else None
+
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    print(f"HN daemon following {fetcher.FIREBASE_BASE} every {args.poll_interval:g}s"
+          + (f", health on :{args.health_port}" if server else ""))
+    try:
+        daemon.run(max_polls=args.max_polls)
+    finally:
+        if server:
+            server.shutdown()
+        daemon.close()
+        print(f"HN daemon stopped: {daemon.events['new']} new, "
+              f"{daemon.events['update']} updates, {daemon.errors} errors")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,693 @@
+#!/usr/bin/env python3
+"""
+Fake HN API Server
+==================
+Local stand-in for the Firebase and Algolia HN APIs, backed by a seeded
+synthetic corpus, so collectors can be load- and failure-tested offline.
+
+  Firebase  /v0/item/<id>.json, /v0/maxitem.json, /v0/updates.json,
+            /v0/{top,new,best,show,ask}stories.json
+  Algolia   /api/v1/search, /api/v1/search_by_date
+            tags (AND with ',', OR with '(a,b)'), numericFilters
+            (created_at_i, points, num_comments), query, hitsPerPage,
+            page — with Algolia's 1000-hit pagination limit
+  Stats     /_stats   request counts per endpoint and status
+
+The corpus keeps only compact per-item arrays (type, parent, story, time,
+author, points) — a million items take a few tens of MB. Titles and texts
+are generated on demand from (seed, id), so every run with the same seed
+serves identical data.
+
+Failure modes: per-request latency (+ jitter), a random 5xx error rate,
+dropped connections, and a token-bucket rate limit answered with 429 +
+Retry-After. With --live-minutes, the newest items are dated into the
+future and appear as the clock reaches them (for tail mode / hn_daemon).
+
+Usage:
+  python3 hn_fake_server.py --items 1000000 --days 365 --port 8080
+  python3 hn_fake_server.py --latency 0.05 --error-rate 0.02 --rate-limit 50 --live-minutes 30
+
+  python3 hn_collector.py 30 /tmp/out --no-cache --algolia-base http://127.0.0.1:8080/api/v1
+  python3 hn_daemon.py --no-cache --firebase-base http://127.0.0.1:8080/v0
+"""
+
+import argparse
+import bisect
+import json
+import math
+import random
+import re
+import threading
+import time
+from array import array
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# ── Corpus shape ───────────────────────────────────────────────────────────
+
+STORY, SHOW_HN, ASK_HN, COMMENT = 1, 2, 3, 4
+STORY_RATIO = 0.15            # of all items
+SHOW_HN_RATIO = 0.10          # of stories
+ASK_HN_RATIO = 0.06           # of stories
+ACTIVE_STORIES = 400          # comments land on one of the newest N stories
+HOT_THREADS = 0.8             # chance a comment joins a thread that just got one
+AUTHORS = 50000
+DEAD_RATIO = 0.01
+DELETED_RATIO = 0.01
+LISTING_SIZE = 500            # ids per /v0/*stories.json
+LISTING_WINDOW = 3 * 86400    # stories considered for top/best/show/ask
+
+# ── Algolia behaviour ──────────────────────────────────────────────────────
+
+HIT_CAP = 1000                # hits reachable through pagination
+MAX_HITS_PER_PAGE = 1000
+DEFAULT_HITS_PER_PAGE = 20
+NUMERIC_RE = re.compile(r'^\s*(created_at_i|points|num_comments)\s*(<=|>=|!=|<|>|=)\s*(-?\d+)\s*$')
+NUMERIC_OPS = {
+    '<': lambda a, b: a < b, '<=': lambda a, b: a <= b, '=': lambda a, b: a == b,
+    '!=': lambda a, b: a != b, '>': lambda a, b: a > b, '>=': lambda a, b: a >= b,
+}
+
+# ── Text generation ────────────────────────────────────────────────────────
+
+TECH = ['Postgres', 'SQLite', 'Rust', 'Go', 'Kubernetes', 'WebAssembly', 'LLM', 'vector database',
+        'RAG pipeline', 'GPU scheduler', 'CRDT', 'eBPF', 'Zig', 'Python', 'TypeScript',
+        'embedding model', 'distributed cache', 'message queue', 'static site generator']
+DOMAINS = ['GDPR compliance', 'invoicing', 'observability', 'home automation', 'CI pipelines',
+           'feature flags', 'log search', 'customer support', 'EU data residency',
+           'on-call scheduling', 'accessibility audits', 'API testing', 'time tracking']
+PRODUCTS = ['Quill', 'Ferrite', 'Lumen', 'Tessera', 'Kestrel', 'Nimbus', 'Orbit', 'Parcel',
+            'Relay', 'Sable', 'Tandem', 'Vesper', 'Wren', 'Yarrow', 'Zephyr', 'Atlas']
+NEWS_VERBS = ['is now generally available', 'hits 1.0', 'considered harmful',
+              'in production: lessons learned', 'explained', 'is faster than you think',
+              'acquired', 'raises Series A', 'and the cost of abstraction']
+SENTENCES = [
+    "I built this because {domain} kept eating our weekends.",
+    "We're building a {tech} layer for {domain} and would love feedback.",
+    "I&#x27;ve been working on this side project for a year.",
+    "How does this compare to running {tech} yourself?",
+    "The architecture is a single {tech} node plus a small backend.",
+    "Pricing is a free tier plus a paid plan for teams; self-hosted is free.",
+    "We tried {tech} for {domain} and the performance was &quot;fine&quot; until it wasn&#x27;t.",
+    "Our API has rate limits of 100 req&#x2F;s, which matters for {domain}.",
+    "Scaling this past a few million rows needed a real database.",
+    "Is there a waitlist or can I sign up today?",
+    "I wrote a longer post about the security model.",
+    "This is the kind of infrastructure I&#x27;d pay for.",
+    "The {tech} deployment story is still the hard part.",
+    "Neat. My project does something similar for {domain}.",
+]
+LINK_TEMPLATES = [
+    'https://github.com/{user}/{slug}', 'https://{slug}.app/demo', 'https://docs.{slug}.dev/guide',
+    'https://{slug}.io', 'https://playground.{slug}.dev', 'https://en.wikipedia.org/wiki/{wiki}',
+]
+
+
+def _link(url):
+    href = url.replace('/', '&#x2F;')
+    return f'<a href="{href}" rel="nofollow">{href}</a>'
+
+
+class SyntheticCorpus:
+    """Seeded HN-like item graph: stories, Show/Ask HN and nested comments.
+
+    Item ids run 1..n in time order across `days` days ending at `end_ts`
+    (+ `live_seconds` in the future). Structure lives in arrays; text is
+    derived from (seed, id) whenever an item is served.
+    """
+
+    def __init__(self, n_items=100000, seed=0, days=30, end_ts=None, live_seconds=0):
+        self.n = n_items
+        self.seed = seed
+        now = int(time.time()) if end_ts is None else int(end_ts)
+        self.start_ts = now - int(days * 86400)
+        self.end_ts = now + int(live_seconds)
+        rnd = random.Random(seed)
+
+        n1 = n_items + 1
+        self.kind = bytearray(n1)
+        self.flags = bytearray(n1)                 # 1 = dead, 2 = deleted
+        self.parent = array('i', bytes(4 * n1))
+        self.root = array('i', bytes(4 * n1))      # story a comment belongs to
+        self.author = array('i', bytes(4 * n1))
+        self.points = array('i', bytes(4 * n1))
+        span = self.end_ts - self.start_ts
+        self.times = array('q', (self.start_ts + (i - 1) * span // max(n_items, 1)
+                                 for i in range(n1)))
+        self.times[0] = self.start_ts
+
+        stories = array('i')
+        active = deque(maxlen=ACTIVE_STORIES)
+        threads = {}                               # active story → its comment ids
+        recent = deque(maxlen=ACTIVE_STORIES * 4)  # stories of the latest comments
+        random_ = rnd.random
+        for i in range(1, n1):
+            self.author[i] = int(AUTHORS * random_() ** 1.5)   # some authors post a lot
+            if not active or random_() < STORY_RATIO:
+                r = random_()
+                self.kind[i] = SHOW_HN if r < SHOW_HN_RATIO else (
+                    ASK_HN if r < SHOW_HN_RATIO + ASK_HN_RATIO else STORY)
+                self.root[i] = i
+                stories.append(i)
+                if len(active) == active.maxlen:
+                    threads.pop(active[0], None)
+                active.append(i)
+                threads[i] = []
+                continue
+            # preferential attachment: busy threads draw most new comments
+            story = recent[int(len(recent) * random_())] if recent and random_() < HOT_THREADS \
+                else active[-1 - int(len(active) * random_() ** 2)]
+            thread = threads.get(story)
+            if thread is None:                     # fell out of the active window
+                story = active[-1]
+                thread = threads[story]
+            recent.append(story)
+            self.kind[i] = COMMENT
+            self.root[i] = story
+            self.parent[i] = story if not thread or random_() < 0.35 else \
+                thread[int(len(thread) * random_())]
+            thread.append(i)
+            r = random_()
+            if r < DEAD_RATIO:
+                self.flags[i] = 1
+            elif r < DEAD_RATIO + DELETED_RATIO:
+                self.flags[i] = 2
+        self.stories = stories
+        self.show_hn = array('i', (i for i in stories if self.kind[i] == SHOW_HN))
+        self.ask_hn = array('i', (i for i in stories if self.kind[i] == ASK_HN))
+
+        # children and per-story comments as CSR (ids ascending)
+        self.kids_ptr, self.kids = self._csr(self.parent)
+        self.thread_ptr, self.thread = self._csr(
+            array('i', (self.root[i] if self.kind[i] == COMMENT else 0 for i in range(n1))))
+        for s in stories:
+            comments = self.thread_ptr[s + 1] - self.thread_ptr[s]
+            self.points[s] = max(1, int(comments * (0.5 + 2.5 * rnd.random())
+                                        + min(rnd.paretovariate(1.3), 500)))
+
+    def _csr(self, parents):
+        counts = array('i', bytes(4 * (self.n + 2)))
+        for p in parents:
+            if p:
+                counts[p + 1] += 1
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        fill = array('i', counts)
+        items = array('i', bytes(4 * counts[-1]))
+        for i, p in enumerate(parents):
+            if p:
+                items[fill[p]] = i
+                fill[p] += 1
+        return counts, items
+
+    # ── Visibility (live mode) ─────────────────────────────────────────
+
+    def max_item(self, now=None):
+        """Newest id whose time has come."""
+        now = time.time() if now is None else now
+        return max(0, min(self.n, bisect.bisect_right(self.times, now, 1) - 1))
+
+    def id_range(self, since=None, until=None, inclusive_since=False):
+        """[lo, hi) ids with since < time <= until (clipped to visible items)."""
+        lo = 1
+        if since is not None:
+            lo = (bisect.bisect_left if inclusive_since else bisect.bisect_right)(
+                self.times, since, 1)
+        hi = self.max_item() + 1
+        if until is not None:
+            hi = min(hi, bisect.bisect_right(self.times, until, 1))
+        return lo, max(lo, hi)
+
+    def kid_ids(self, item_id, visible):
+        kids = self.kids[self.kids_ptr[item_id]:self.kids_ptr[item_id + 1]]
+        return [k for k in kids if k <= visible]
+
+    def descendants(self, story_id, visible):
+        lo, hi = self.thread_ptr[story_id], self.thread_ptr[story_id + 1]
+        return bisect.bisect_right(self.thread, visible, lo, hi) - lo
+
+    # ── Text ───────────────────────────────────────────────────────────
+
+    def _rnd(self, item_id):
+        return random.Random(self.seed * 1000003 + item_id)
+
+    def author_name(self, item_id):
+        return f"user{self.author[item_id]}"
+
+    def _words(self, rnd):
+        tech = rnd.choice(TECH)
+        return {'tech': tech, 'wiki': tech.replace(' ', '_'), 'domain': rnd.choice(DOMAINS),
+                'slug': rnd.choice(PRODUCTS).lower() + str(rnd.randint(1, 999)),
+                'user': f"user{rnd.randint(0, AUTHORS)}"}
+
+    def title(self, item_id):
+        rnd = self._rnd(item_id)
+        w = self._words(rnd)
+        kind = self.kind[item_id]
+        if kind == SHOW_HN:
+            return (f"Show HN: {rnd.choice(PRODUCTS)} – an open-source {w['tech']} "
+                    f"for {w['domain']}")
+        if kind == ASK_HN:
+            return f"Ask HN: How do you handle {w['domain']} with {w['tech']}?"
+        return f"{w['tech']} {rnd.choice(NEWS_VERBS)}"
+
+    def url(self, item_id):
+        if self.kind[item_id] == ASK_HN:
+            return None
+        rnd = self._rnd(item_id)
+        w = self._words(rnd)
+        return rnd.choice(LINK_TEMPLATES).format(**w)
+
+    def text(self, item_id):
+        """HN-style HTML body: &#x27; entities, <p> paragraphs, <a href> links."""
+        kind = self.kind[item_id]
+        if kind == STORY:
+            return None
+        rnd = self._rnd(item_id + 7919)
+        paragraphs = []
+        for _ in range(rnd.randint(1, 4)):
+            w = self._words(rnd)
+            para = ' '.join(rnd.choice(SENTENCES).format(**w) for _ in range(rnd.randint(1, 3)))
+            if rnd.random() < 0.25:
+                para += ' ' + _link(rnd.choice(LINK_TEMPLATES).format(**w))
+            paragraphs.append(para)
+        return '<p>'.join(paragraphs)
+
+    # ── Firebase ───────────────────────────────────────────────────────
+
+    def item(self, item_id):
+        visible = self.max_item()
+        if not 1 <= item_id <= visible:
+            return None
+        kind = self.kind[item_id]
+        out = {'id': item_id, 'time': self.times[item_id]}
+        if self.flags[item_id] == 2:
+            out.update(deleted=True, type='comment', parent=self.parent[item_id])
+            return out
+        kids = self.kid_ids(item_id, visible)
+        if kind == COMMENT:
+            out.update(type='comment', by=self.author_name(item_id),
+                       parent=self.parent[item_id], text=self.text(item_id))
+            if self.flags[item_id] == 1:
+                out['dead'] = True
+        else:
+            out.update(type='story', by=self.author_name(item_id), title=self.title(item_id),
+                       score=self.points[item_id],
+                       descendants=self.descendants(item_id, visible))
+            url, text = self.url(item_id), self.text(item_id)
+            if url:
+                out['url'] = url
+            if text:
+                out['text'] = text
+        if kids:
+            out['kids'] = kids
+        return out
+
+    def listing(self, name):
+        """Ids for /v0/<name>.json, like the live lists (at most LISTING_SIZE)."""
+        now = time.time()
+        lo, hi = self.id_range(since=now - LISTING_WINDOW)
+        pool = {'show': self.show_hn, 'ask': self.ask_hn}.get(name, self.stories)
+        ids = pool[bisect.bisect_left(pool, lo):bisect.bisect_left(pool, hi)]
+        if name == 'new':
+            return list(reversed(ids))[:LISTING_SIZE]
+        if name == 'best':
+            return sorted(ids, key=lambda i: -self.points[i])[:LISTING_SIZE]
+        # top / show / ask: points decayed by age, like the front page
+        return sorted(ids, key=lambda i: -(self.points[i] - 1) /
+                      ((now - self.times[i]) / 3600 + 2) ** 1.8)[:LISTING_SIZE]
+
+    def updates(self, window=120):
+        """Recently created comments and the stories they changed."""
+        lo, hi = self.id_range(since=time.time() - window)
+        changed = []
+        for i in range(max(lo, hi - 100), hi):
+            changed.append(i)
+            if self.kind[i] == COMMENT:
+                changed.append(self.root[i])
+        items = list(dict.fromkeys(reversed(changed)))[:100]
+        return {'items': items,
+                'profiles': list(dict.fromkeys(self.author_name(i) for i in items))[:50]}
+
+    # ── Algolia ────────────────────────────────────────────────────────
+
+    def _tags(self, item_id):
+        kind = self.kind[item_id]
+        tags = ['comment' if kind == COMMENT else 'story',
+                f"author_{self.author_name(item_id)}", f"story_{self.root[item_id]}"]
+        if kind == SHOW_HN:
+            tags.append('show_hn')
+        elif kind == ASK_HN:
+            tags.append('ask_hn')
+        return tags
+
+    def hit(self, item_id):
+        ts = self.times[item_id]
+        out = {
+            'objectID': str(item_id),
+            'author': self.author_name(item_id),
+            'created_at': datetime.fromtimestamp(ts, tz=timezone.utc).strftime(
+                '%Y-%m-%dT%H:%M:%S.000Z'),
+            'created_at_i': ts,
+            '_tags': self._tags(item_id),
+        }
+        if self.kind[item_id] == COMMENT:
+            out.update(comment_text=self.text(item_id), points=None,
+                       story_id=self.root[item_id], parent_id=self.parent[item_id],
+                       story_title=self.title(self.root[item_id]))
+        else:
+            out.update(title=self.title(item_id), url=self.url(item_id),
+                       points=self.points[item_id],
+                       num_comments=self.descendants(item_id, self.max_item()),
+                       story_text=self.text(item_id))
+        return out
+
+    def _numeric(self, item_id, field, visible):
+        if field == 'created_at_i':
+            return self.times[item_id]
+        if self.kind[item_id] == COMMENT:
+            return None
+        if field == 'points':
+            return self.points[item_id]
+        return self.descendants(item_id, visible)
+
+    def _matches_tag(self, item_id, tag):
+        kind = self.kind[item_id]
+        if tag == 'story':
+            return kind != COMMENT
+        if tag == 'comment':
+            return kind == COMMENT
+        if tag == 'show_hn':
+            return kind == SHOW_HN
+        if tag == 'ask_hn':
+            return kind == ASK_HN
+        if tag.startswith('story_'):
+            return tag[6:].isdigit() and self.root[item_id] == int(tag[6:])
+        if tag.startswith('author_'):
+            return tag[7:] == self.author_name(item_id)
+        return False
+
+    def search(self, tags=(), numeric=(), query=None, by_date=True):
+        """Matching ids in result order: newest first, or by points for `search`."""
+        visible = self.max_item()
+        since = until = None
+        checks = []
+        for field, op, value in numeric:
+            if field == 'created_at_i' and op in ('>', '>='):
+                since = value if since is None else max(since, value)
+            elif field == 'created_at_i' and op in ('<', '<='):
+                bound = value - 1 if op == '<' else value
+                until = bound if until is None else min(until, bound)
+            checks.append((field, NUMERIC_OPS[op], value))
+        lo, hi = self.id_range(since, until, inclusive_since=any(
+            f == 'created_at_i' and op == '>=' for f, op, _ in numeric))
+
+        # narrowest candidate source first
+        flat = [t for group in tags for t in group]
+        story_roots = None
+        for group in tags:
+            if all(t.startswith('story_') and t[6:].isdigit() for t in group):
+                roots = {int(t[6:]) for t in group}
+                story_roots = roots if story_roots is None else story_roots & roots
+        if story_roots is not None:
+            candidates = []
+            for s in sorted(story_roots):
+                if 1 <= s <= self.n and self.kind[s] != COMMENT:
+                    candidates.append(s)
+                    candidates.extend(self.thread[self.thread_ptr[s]:self.thread_ptr[s + 1]])
+            candidates = [i for i in sorted(candidates) if lo <= i < hi]
+        elif ['show_hn'] in tags or ['ask_hn'] in tags or ['story'] in tags:
+            pool = (self.show_hn if ['show_hn'] in tags else
+                    self.ask_hn if ['ask_hn'] in tags else self.stories)
+            candidates = pool[bisect.bisect_left(pool, lo):bisect.bisect_left(pool, hi)]
+        else:
+            candidates = range(lo, hi)
+        needs_tags = [g for g in tags if g not in (['story'], ['comment'], ['show_hn'], ['ask_hn'])
+                      or 'comment' in flat]
+
+        needle = query.lower() if query else None
+        matched = []
+        for i in candidates:
+            if self.flags[i]:
+                continue
+            if needs_tags and not all(any(self._matches_tag(i, t) for t in g) for g in needs_tags):
+                continue
+            if checks:
+                ok = True
+                for field, op, value in checks:
+                    v = self._numeric(i, field, visible)
+                    if v is None or not op(v, value):
+                        ok = False
+                        break
+                if not ok:
+                    continue
+            if needle and needle not in (self.title(self.root[i]) or '').lower():
+                continue
+            matched.append(i)
+        if by_date:
+            matched.reverse()
+        else:
+            matched.sort(key=lambda i: (-self.points[i], i))
+        return matched
+
+
+def parse_tags(value):
+    """'comment,(story_1,story_2)' → [['comment'], ['story_1', 'story_2']] (AND of ORs)."""
+    groups = []
+    for part in re.findall(r'\([^)]*\)|[^,()]+', value or ''):
+        part = part.strip()
+        if part.startswith('('):
+            group = [t.strip() for t in part[1:-1].split(',') if t.strip()]
+        else:
+            group = [part]
+        if group:
+            groups.append(group)
+    return groups
+
+
+def parse_numeric_filters(value):
+    filters = []
+    for part in (value or '').split(','):
+        if not part.strip():
+            continue
+        m = NUMERIC_RE.match(part)
+        if not m:
+            raise ValueError(f"invalid numericFilters: {part!r}")
+        filters.append((m.group(1), m.group(2), int(m.group(3))))
+    return filters
+
+
+# ── Server ─────────────────────────────────────────────────────────────────
+
+class FakeHNServer:
+    """ThreadingHTTPServer serving a SyntheticCorpus with configurable faults."""
+
+    def __init__(self, corpus, host='127.0.0.1', port=0, latency=0.0, jitter=0.5,
+                 error_rate=0.0, drop_rate=0.0, rate_limit=None, burst=None,
+                 retry_after=1, seed=0):
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.rate_limit = rate_limit        # requests per second, None = unlimited
+        self.burst = burst or (rate_limit or 1)
+        self.retry_after = retry_after
+        self.stats = defaultdict(int)
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def firebase_base(self):
+        return f"{self.url}/v0"
+
+    @property
+    def algolia_base(self):
+        return f"{self.url}/api/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ── Faults ─────────────────────────────────────────────────────────
+
+    def _take_token(self):
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_limit)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def _fault(self):
+        """None, 'drop', or an HTTP error status for this request."""
+        with self._lock:
+            r = self._rnd.random()
+            status = self._rnd.choice((500, 502, 503))
+            delay = self.latency * (1 + self.jitter * (2 * self._rnd.random() - 1))
+        if delay > 0:
+            time.sleep(delay)
+        if not self._take_token():
+            return 429
+        if r < self.drop_rate:
+            return 'drop'
+        if r < self.drop_rate + self.error_rate:
+            return status
+        return None
+
+    # ── Routing ────────────────────────────────────────────────────────
+
+    def route(self, path, params):
+        """(status, body) for a request that got past the fault injection."""
+        corpus = self.corpus
+        m = re.fullmatch(r'/v0/item/(\d+)\.json', path)
+        if m:
+            return 200, corpus.item(int(m.group(1)))
+        m = re.fullmatch(r'/v0/(top|new|best|show|ask)stories\.json', path)
+        if m:
+            return 200, corpus.listing(m.group(1))
+        if path == '/v0/maxitem.json':
+            return 200, corpus.max_item()
+        if path == '/v0/updates.json':
+            return 200, corpus.updates()
+        m = re.fullmatch(r'/api/v1/(search|search_by_date)', path)
+        if m:
+            return self.algolia(params, by_date=m.group(1) == 'search_by_date')
+        if path == '/_stats':
+            with self._lock:
+                return 200, dict(self.stats)
+        return 404, {'message': 'Not Found', 'status': 404}
+
+    def algolia(self, params, by_date):
+        try:
+            tags = parse_tags(params.get('tags'))
+            numeric = parse_numeric_filters(params.get('numericFilters'))
+            per_page = int(params.get('hitsPerPage', DEFAULT_HITS_PER_PAGE))
+            page = int(params.get('page', 0))
+        except ValueError as e:
+            return 400, {'message': str(e), 'status': 400}
+        per_page = max(1, min(per_page, MAX_HITS_PER_PAGE))
+        started = time.perf_counter()
+        ids = self.corpus.search(tags, numeric, params.get('query'), by_date=by_date)
+        reachable = ids[:HIT_CAP]
+        page_ids = reachable[page * per_page:(page + 1) * per_page] if page >= 0 else []
+        return 200, {
+            'hits': [self.corpus.hit(i) for i in page_ids],
+            'nbHits': len(ids),
+            'page': page,
+            'nbPages': math.ceil(len(reachable) / per_page),
+            'hitsPerPage': per_page,
+            'exhaustiveNbHits': True,
+            'query': params.get('query', ''),
+            'processingTimeMS': int((time.perf_counter() - started) * 1000),
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'   # keep-alive, like the real APIs
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                endpoint = re.sub(r'/\d+\.json$', '/<id>.json', parsed.path)
+                fault = None if parsed.path == '/_stats' else server._fault()
+                if fault == 'drop':
+                    with server._lock:
+                        server.stats[f"{endpoint} dropped"] += 1
+                    self.close_connection = True
+                    return
+                if fault is not None:
+                    status, body = fault, {'message': 'injected failure', 'status': fault}
+                else:
+                    status, body = server.route(parsed.path, params)
+                with server._lock:
+                    server.stats[f"{endpoint} {status}"] += 1
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                if status == 429:
+                    self.send_header('Retry-After', str(server.retry_after))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local fake HN Firebase + Algolia API.")
+    parser.add_argument('--items', type=int, default=100000, help="corpus size (default: %(default)s)")
+    parser.add_argument('--days', type=float, default=30, help="time span of the corpus")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--live-minutes', type=float, default=0,
+                        help="date the newest items this far into the future; they appear "
+                             "as time passes")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added per request")
+    parser.add_argument('--jitter', type=float, default=0.5, help="± fraction of --latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction answered 5xx")
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help="fraction of connections closed without a response")
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help="requests per second before answering 429")
+    parser.add_argument('--burst', type=float, default=None)
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After on 429 (seconds)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    corpus = SyntheticCorpus(args.items, seed=args.seed, days=args.days,
+                             live_seconds=args.live_minutes * 60)
+    print(f"Corpus: {corpus.n:,} items, {len(corpus.stories):,} stories "
+          f"({len(corpus.show_hn):,} Show HN), built in {time.perf_counter() - started:.1f}s")
+    server = FakeHNServer(corpus, args.host, args.port, latency=args.latency,
+                          jitter=args.jitter, error_rate=args.error_rate,
+                          drop_rate=args.drop_rate, rate_limit=args.rate_limit,
+                          burst=args.burst, retry_after=args.retry_after, seed=args.seed)
+    print(f"Firebase: {server.firebase_base}\nAlgolia:  {server.algolia_base}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,11 +4,16 @@ Detects problem emergence and builder presence
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import re
 from dataclasses import dataclass, asdict
 import json
+import threading
+import time
+
+from hn_cache import ResponseCache, cache_key, ttl_for_age
 
 
 @dataclass
@@ -43,116 +48,380 @@ class HNSignal:
         return d
 
 
+class KeywordScanner:
+    """Aho-Corasick automaton: find every keyword occurring in a text in one pass
+    
+    Matches are plain case-insensitive substrings, like ``kw in text.lower()``.
+    """
+    
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(dict.fromkeys(kw.lower() for kw in keywords))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[frozenset] = [frozenset()]
+        
+        outputs = [set()]
+        for kw in self.keywords:
+            node = 0
+            for ch in kw:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                node = nxt
+            outputs[node].add(kw)
+        
+        # Breadth-first failure links; each node inherits its fallback's outputs
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, nxt in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+                queue.append(nxt)
+        self._out = [frozenset(o) for o in outputs]
+    
+    def find(self, text: str) -> set:
+        """Return the set of keywords occurring in text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+
 class HNFetcher:
     """Fetch data from Hacker News APIs"""
     
     FIREBASE_BASE = "https://hacker-news.firebaseio.com/v0"
     ALGOLIA_BASE = "http://hn.algolia.com/api/v1"
     
-    def __init__(self):
+    MAX_WORKERS = 16  # concurrent item requests
+    REQUEST_TIMEOUT = 10  # seconds per request
+    
+    COMMENT_TREE_DEPTH = 4  # reply levels expanded below a story
+    COMMENT_TREE_MAX_ITEMS = 60  # comments fetched per story
+    COMMENT_TREE_TIME_BUDGET = 8.0  # seconds of fetching per story's tree
+    
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None,
+                 cache: Optional[ResponseCache] = None, use_cache: bool = True,
+                 firebase_base: Optional[str] = None):
+        # firebase_base points the fetcher at another server (e.g. a local fake)
+        if firebase_base:
+            self.FIREBASE_BASE = firebase_base.rstrip('/')
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.timeout = timeout or self.REQUEST_TIMEOUT
+        # Items are cached on disk; TTL depends on how old the item is
+        self.cache = cache or (ResponseCache() if use_cache else None)
         self.session = requests.Session()
+        # One pooled connection per worker so concurrent fetches reuse sockets
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.requests = 0  # HTTP requests sent (cache hits excluded)
+        self._requests_lock = threading.Lock()
+        self.trees_cut = 0  # comment trees cut short by their time budget, all calls
+        self.last_cut_trees: set = set()  # item ids cut short in the last get_comment_trees
     
-    def get_story(self, story_id: int) -> Dict:
-        """Get single story from Firebase API"""
+    def _get(self, url: str) -> requests.Response:
+        """GET url; error statuses raise requests.HTTPError instead of
+        handing their JSON error body to the caller as data"""
+        with self._requests_lock:
+            self.requests += 1
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+    
+    def get_story(self, story_id: int, fresh: bool = False) -> Dict:
+        """Get single story from Firebase API
+        
+        ``fresh`` skips the cache lookup (the result is still cached), for
+        items known to have changed.
+        """
         url = f"{self.FIREBASE_BASE}/item/{story_id}.json"
-        response = self.session.get(url)
-        return response.json()
+        key = cache_key(url)
+        if self.cache and not fresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = self._get(url)
+        item = response.json()
+        if item is not None and not (isinstance(item, dict) and 'type' in item):
+            # never cache (or return) an error body in place of an item
+            raise ValueError(f"not an item: {str(item)[:200]}")
+        if self.cache and item:
+            age = time.time() - item.get('time', time.time())
+            self.cache.set(key, item, ttl_for_age(age))
+        return item
+    
+    def _get_story_safe(self, story_id: int, fresh: bool = False,
+                        errors: Optional[List[int]] = None) -> Optional[Dict]:
+        """Fetch one item for a batch, turning errors into a missing item
+        
+        Failed ids are appended to ``errors`` when it is given.
+        """
+        try:
+            return self.get_story(story_id, fresh=fresh)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error fetching item {story_id}: {e}")
+            if errors is not None:
+                errors.append(story_id)
+            return None
+    
+    def get_stories(self, story_ids: List[int], fresh: bool = False,
+                    errors: Optional[List[int]] = None) -> List[Optional[Dict]]:
+        """Fetch many items concurrently, returned in the order of story_ids.
+        
+        Items that fail to load come back as None; pass an ``errors`` list to
+        tell failed requests apart from items the API returned as null.
+        """
+        story_ids = list(story_ids)
+        if len(story_ids) <= 1 or self.max_workers <= 1:
+            return [self._get_story_safe(story_id, fresh, errors) for story_id in story_ids]
+        
+        workers = min(self.max_workers, len(story_ids))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._get_story_safe, story_ids, [fresh] * len(story_ids),
+                                 [errors] * len(story_ids)))
     
-    def get_show_hn_stories(self, days_back: int = 7) -> List[Dict]:
+    def get_max_item(self) -> int:
+        """Id of the newest item on HN (never cached)"""
+        url = f"{self.FIREBASE_BASE}/maxitem.json"
+        return int(self._get(url).json())
+    
+    def get_updates(self) -> Dict[str, List]:
+        """Recently changed items and profiles: {'items': [...], 'profiles': [...]}"""
+        url = f"{self.FIREBASE_BASE}/updates.json"
+        return self._get(url).json() or {}
+    
+    def get_candidate_pool(self, max_ids: int = 200) -> List[Dict]:
+        """Fetch the current top stories once, for several scans to share"""
+        url = f"{self.FIREBASE_BASE}/topstories.json"
+        response = self._get(url)
+        story_ids = response.json()[:max_ids]
+        return [story for story in self.get_stories(story_ids) if story]
+    
+    def _scan_top_stories(self, matches, limit: int, max_ids: int = 200,
+                          pool: Optional[List[Dict]] = None) -> List[Dict]:
+        """Walk top stories in order, fetching a batch at a time, until limit matches"""
+        if pool is not None:
+            batches = [pool]
+        else:
+            url = f"{self.FIREBASE_BASE}/topstories.json"
+            response = self._get(url)
+            story_ids = response.json()[:max_ids]
+            batches = (self.get_stories(story_ids[start:start + self.max_workers])
+                       for start in range(0, len(story_ids), self.max_workers))
+        
+        stories = []
+        for batch in batches:
+            for story in batch:
+                if not story:
+                    continue
+                if matches(story):
+                    stories.append(story)
+                # Stop if we have enough
+                if len(stories) >= limit:
+                    return stories
+        
+        return stories
+    
+    def get_show_hn_stories(self, days_back: int = 7, pool: Optional[List[Dict]] = None) -> List[Dict]:
         """Get Show HN stories by checking recent stories"""
         # Firebase doesn't have a show_hn filter, so we check top/new stories
         # and filter for "Show HN" in title
         cutoff = datetime.now() - timedelta(days=days_back)
         cutoff_ts = int(cutoff.timestamp())
         
-        stories = []
+        def is_recent_show_hn(story):
+            title = story.get('title', '').lower()
+            created_at = story.get('time', 0)
+            return 'show hn' in title and created_at > cutoff_ts
         
-        # Get recent top stories
-        url = f"{self.FIREBASE_BASE}/topstories.json"
         try:
-            response = self.session.get(url, timeout=10)
-            story_ids = response.json()[:200]  # Check last 200 top stories
-            
-            for story_id in story_ids:
-                story = self.get_story(story_id)
-                if not story:
-                    continue
-                
-                # Check if it's a Show HN and recent enough
-                title = story.get('title', '').lower()
-                created_at = story.get('time', 0)
-                
-                if 'show hn' in title and created_at > cutoff_ts:
-                    stories.append(story)
-                
-                # Stop if we have enough
-                if len(stories) >= 30:
-                    break
-            
+            # Check last 200 top stories
+            return self._scan_top_stories(is_recent_show_hn, limit=30, pool=pool)
         except Exception as e:
             print(f"Error fetching Show HN stories: {e}")
-        
-        return stories
+            return []
     
     def get_top_stories(self, limit: int = 100) -> List[int]:
         """Get top story IDs from Firebase"""
         url = f"{self.FIREBASE_BASE}/topstories.json"
-        response = self.session.get(url)
+        response = self._get(url)
         return response.json()[:limit]
     
-    def search_by_keyword(self, query: str, days_back: int = 7) -> List[Dict]:
+    def search_by_keyword(self, query: str, days_back: int = 7,
+                          pool: Optional[List[Dict]] = None) -> List[Dict]:
         """Search HN by scanning recent stories for keywords"""
         cutoff = datetime.now() - timedelta(days=days_back)
         cutoff_ts = int(cutoff.timestamp())
-        
-        stories = []
         query_lower = query.lower()
         
-        # Get recent top stories
-        url = f"{self.FIREBASE_BASE}/topstories.json"
+        def matches_query(story):
+            title = story.get('title', '').lower()
+            text = story.get('text', '').lower() if story.get('text') else ''
+            created_at = story.get('time', 0)
+            return (query_lower in title or query_lower in text) and created_at > cutoff_ts
+        
         try:
-            response = self.session.get(url, timeout=10)
-            story_ids = response.json()[:200]  # Check last 200 stories
-            
-            for story_id in story_ids:
-                story = self.get_story(story_id)
-                if not story:
-                    continue
-                
-                # Check if keyword matches and recent enough
-                title = story.get('title', '').lower()
-                text = story.get('text', '').lower() if story.get('text') else ''
-                created_at = story.get('time', 0)
-                
-                if query_lower in title or query_lower in text:
-                    if created_at > cutoff_ts:
-                        stories.append(story)
-                
-                # Stop if we have enough
-                if len(stories) >= 20:
-                    break
-            
+            # Check last 200 stories
+            return self._scan_top_stories(matches_query, limit=20, pool=pool)
         except Exception as e:
             print(f"Error searching for '{query}': {e}")
+            return []
+    
+    def scan_keywords(self, keywords: List[str], days_back: int = 7,
+                      pool: Optional[List[Dict]] = None, limit: int = 20) -> Dict[str, List[Dict]]:
+        """Match every keyword against the candidate pool in a single pass
         
-        return stories
+        Equivalent to calling search_by_keyword once per keyword, but each
+        story is fetched and scanned once. Returns hits per keyword, in
+        top-story order, capped at limit.
+        """
+        cutoff_ts = int((datetime.now() - timedelta(days=days_back)).timestamp())
+        scanner = KeywordScanner(keywords)
+        hits = {kw: [] for kw in keywords}
+        
+        try:
+            if pool is None:
+                pool = self.get_candidate_pool()
+        except Exception as e:
+            print(f"Error scanning keywords: {e}")
+            return hits
+        
+        for story in pool:
+            if story.get('time', 0) <= cutoff_ts:
+                continue
+            # NUL never occurs in a keyword, so no match can span title and text
+            found = scanner.find(f"{story.get('title') or ''}\x00{story.get('text') or ''}")
+            for kw in keywords:
+                if kw.lower() in found and len(hits[kw]) < limit:
+                    hits[kw].append(story)
+        
+        return hits
+    
+    @staticmethod
+    def _to_comment(comment: Optional[Dict]) -> Optional[Dict]:
+        if comment and comment.get('text'):
+            return {
+                'author': comment.get('by', ''),
+                'text': comment.get('text', ''),
+                'created_at': datetime.fromtimestamp(comment.get('time', 0))
+            }
+        return None
     
     def get_item_comments(self, item_id: int, max_comments: int = 10) -> List[Dict]:
-        """Get comments for an item (recursive fetch of top-level comments)"""
-        item = self.get_story(item_id)
-        kids = item.get('kids', [])[:max_comments]
-        
-        comments = []
-        for kid_id in kids:
-            comment = self.get_story(kid_id)
-            if comment and comment.get('text'):
-                comments.append({
-                    'author': comment.get('by', ''),
-                    'text': comment.get('text', ''),
-                    'created_at': datetime.fromtimestamp(comment.get('time', 0))
-                })
-        
-        return comments
+        """Get top-level comments for an item id (see get_comment_tree for loaded items)"""
+        item = self.get_story(item_id) or {}
+        return self.get_comment_tree(item, max_depth=1, max_items=max_comments)
+    
+    def get_comment_tree(self, item: Dict, max_depth: Optional[int] = None,
+                         max_items: Optional[int] = None,
+                         time_budget: Optional[float] = None) -> List[Dict]:
+        """Comment tree of an already-loaded item (see get_comment_trees)"""
+        item_id = item.get('id') or item.get('objectID')
+        return self.get_comment_trees([item], max_depth, max_items, time_budget)[item_id]
+    
+    def get_comment_trees(self, items: List[Dict], max_depth: Optional[int] = None,
+                          max_items: Optional[int] = None,
+                          time_budget: Optional[float] = None) -> Dict[int, List[Dict]]:
+        """Breadth-first comment trees for loaded items, keyed by item id.
+        
+        All trees are expanded together, one level at a time, each level
+        fetched concurrently. Each tree stops at ``max_depth`` levels,
+        ``max_items`` fetched comments, or once ``time_budget`` seconds of
+        fetching have been charged to it: every chunk's wall time is split
+        over the trees in it by their share of its requests, so a story's
+        cut does not depend on where it sits in ``items``. Ids of trees cut
+        by time are left in ``last_cut_trees`` and counted in ``trees_cut``.
+        
+        Trees are flat lists in BFS order (top-level comments first); each
+        comment carries ``id``, ``parent`` and ``depth`` besides the usual
+        ``author``, ``text`` and ``created_at``. Deleted and dead comments
+        are left out, but their replies are still visited.
+        """
+        max_depth = self.COMMENT_TREE_DEPTH if max_depth is None else max_depth
+        max_items = self.COMMENT_TREE_MAX_ITEMS if max_items is None else max_items
+        time_budget = self.COMMENT_TREE_TIME_BUDGET if time_budget is None else time_budget
+        
+        trees: Dict[int, List[Dict]] = {}
+        budget: Dict[int, int] = {}
+        spent: Dict[int, float] = {}  # seconds of fetching charged to each tree
+        cut = set()
+        frontier = []  # (root id, comment id, parent id, depth)
+        for item in items:
+            item_id = item.get('id') or item.get('objectID')
+            trees[item_id] = []
+            budget[item_id] = max_items
+            spent[item_id] = 0.0
+            frontier.extend((item_id, kid, item_id, 1) for kid in item.get('kids', []))
+        
+        while frontier:
+            wave = []
+            for entry in frontier:
+                if budget[entry[0]] > 0:
+                    budget[entry[0]] -= 1
+                    wave.append(entry)
+            frontier = []
+            # chunks of one request per worker, so budgets are checked often
+            for start in range(0, len(wave), self.max_workers):
+                chunk = []
+                for entry in wave[start:start + self.max_workers]:
+                    if spent[entry[0]] >= time_budget:
+                        cut.add(entry[0])
+                    else:
+                        chunk.append(entry)
+                if not chunk:
+                    continue
+                started = time.monotonic()
+                fetched = self.get_stories([entry[1] for entry in chunk])
+                share = (time.monotonic() - started) / len(chunk)
+                for entry in chunk:
+                    spent[entry[0]] += share
+                for (root, comment_id, parent, depth), raw in zip(chunk, fetched):
+                    if not raw:
+                        continue
+                    comment = None if raw.get('dead') else self._to_comment(raw)
+                    if comment:
+                        trees[root].append({'id': comment_id, 'parent': parent, 'depth': depth,
+                                            **comment})
+                    if depth < max_depth:
+                        frontier.extend((root, kid, comment_id, depth + 1)
+                                        for kid in raw.get('kids', []))
+        self.last_cut_trees = cut
+        self.trees_cut += len(cut)
+        return trees
+    
+    def get_comments_for_items(self, items: List[Dict], max_depth: Optional[int] = None,
+                               max_items: Optional[int] = None,
+                               time_budget: Optional[float] = None) -> Dict[int, List[Dict]]:
+        """Comment trees for many items, keyed by item id.
+        
+        Items already carrying ``kids`` (Firebase format) are not refetched.
+        """
+        missing = [item.get('id') or item.get('objectID') for item in items if 'kids' not in item]
+        refetched = dict(zip(missing, self.get_stories(missing)))
+        
+        loaded = []
+        for item in items:
+            item_id = item.get('id') or item.get('objectID')
+            if item_id in refetched:
+                item = dict(refetched[item_id] or {}, id=item_id)
+            loaded.append(item)
+        return self.get_comment_trees(loaded, max_depth, max_items, time_budget)
 
 
 class HNAnalyzer:
@@ -188,26 +457,31 @@ class HNAnalyzer:
         'llm', 'ai', 'neural', 'embedding', 'vector', 'rag', 'fine-tuning'
     ]
     
+    DEPTH_COMMENTS = 10  # comments depth scoring sees: the count process_story loaded before trees
+    
     def __init__(self):
         self.builder_regex = re.compile('|'.join(self.BUILDER_PATTERNS), re.IGNORECASE)
         self.experiment_regex = re.compile('|'.join(self.EXPERIMENT_PATTERNS), re.IGNORECASE)
     
     def detect_builder_presence(self, title: str, text: Optional[str], comments: List[Dict], author: str) -> bool:
         """Detect if post author is a builder"""
+        # Check if author is active in comments (shows commitment); cheaper
+        # than the regexes, so it goes first
+        author_comments = [c for c in comments if c['author'] == author]
+        if len(author_comments) >= 2:
+            return True
+        
         # Check title and text
         full_text = f"{title} {text or ''}"
         if self.builder_regex.search(full_text) or self.experiment_regex.search(full_text):
             return True
         
-        # Check if author is active in comments (shows commitment)
-        author_comments = [c for c in comments if c['author'] == author]
-        if len(author_comments) >= 2:
-            return True
-        
         return False
     
     def calculate_technical_depth(self, title: str, text: Optional[str], comments: List[Dict]) -> int:
         """Score technical depth 0-10"""
+        # comment trees run to COMMENT_TREE_MAX_ITEMS; score the first few as before
+        comments = comments[:self.DEPTH_COMMENTS]
         score = 0
         full_text = f"{title} {text or ''}".lower()
         
@@ -269,16 +543,189 @@ class HNAnalyzer:
         # Fallback: use title
         return title[:200]
 
+    def signal_type(self, title: str, builder_present: bool, links: Dict[str, List[str]]) -> str:
+        """show_hn / launch / discussion from the analysis results"""
+        signal_type = "discussion"
+        if 'show hn' in title.lower():
+            signal_type = "show_hn"
+        
+        if builder_present and (links['github'] or links['demo']):
+            signal_type = "launch"
+        
+        return signal_type
+    
+    def analyze_story(self, story: Dict, comments: Optional[List[Dict]] = None) -> Dict:
+        """Builder flag, technical depth, links and signal type of one raw story
+        
+        ``story`` is a Firebase/Algolia dict as taken by process_story;
+        ``comments`` defaults to its 'comments' entry.
+        """
+        title = story.get('title', '')
+        text = story.get('text') or story.get('story_text')
+        author = story.get('by') or story.get('author', '')
+        if comments is None:
+            comments = story.get('comments') or []
+        
+        builder_present = self.detect_builder_presence(title, text, comments, author)
+        links = self.extract_links(title, text, story.get('url'))
+        return {
+            'builder_present': builder_present,
+            'technical_depth_score': self.calculate_technical_depth(title, text, comments),
+            'links': links,
+            'signal_type': self.signal_type(title, builder_present, links),
+        }
+    
+    def analyze_batch(self, stories: List[Dict]) -> List[Dict]:
+        """analyze_story for many stories, each with its comments under 'comments'"""
+        return [self.analyze_story(story) for story in stories]
+
+
+class SignalQueryPlan:
+    """Cheap predicates first for get_daily_signals
+    
+    Works out from raw story fields which posts can still reach the
+    thresholds, and spends comment fetches and analysis only on those:
+    
+    1. free: posts process_story would reject, posts already over
+       ``min_score``, and posts whose technical depth cannot reach
+       ``min_technical_depth`` even with ideal comments
+    2. probe: the rest load only the first PROBE_COMMENTS top-level
+       comments. Those are the only comments depth scores by content, so
+       the bound becomes exact apart from the comment-count bonus.
+    
+    Only posts that provably fail are pruned, so results do not change.
+    ``stats`` records what was skipped; ``requests_saved`` is net of the
+    probe requests, which kept posts spend on top of their full fetch.
+    """
+    
+    KEYWORD_MIN_SCORE = 20  # keyword hits must reach this many points
+    PROBE_COMMENTS = 5  # calculate_technical_depth reads comments[:5]
+    
+    def __init__(self, analyzer: HNAnalyzer, min_score: int, min_technical_depth: int,
+                 comment_items: int = HNFetcher.COMMENT_TREE_MAX_ITEMS):
+        self.analyzer = analyzer
+        self.min_score = min_score
+        self.min_technical_depth = min_technical_depth
+        self.comment_items = comment_items
+        self.stats: Dict[str, float] = {
+            'considered': 0, 'pruned': 0, 'probed': 0, 'probe_requests': 0, 'requests_saved': 0,
+            'analysed': 0, 'analysis_s': 0.0,
+        }
+    
+    @staticmethod
+    def _fields(story: Dict):
+        score = story.get('score') or story.get('points', 0)
+        num_comments = (story.get('descendants') or story.get('num_comments')
+                        or len(story.get('kids', [])))
+        return score, num_comments
+    
+    def depth_upper_bound(self, story: Dict, probe: Optional[List[Dict]] = None) -> int:
+        """Highest technical_depth_score process_story could give this story
+        
+        ``probe`` holds the story's first PROBE_COMMENTS top-level comments,
+        when known.
+        """
+        title = story.get('title', '')
+        text = story.get('text') or story.get('story_text')
+        _, num_comments = self._fields(story)
+        if probe is not None:
+            bound = self.analyzer.calculate_technical_depth(title, text, probe)
+        else:
+            bound = self.analyzer.calculate_technical_depth(title, text, [])
+            if num_comments > 0:
+                bound += 3  # keywords in comments
+                if 'github' not in f"{title} {text or ''}".lower():
+                    bound += 2  # a GitHub link in the comments
+        if num_comments > 0:
+            bound += 2 if num_comments > 20 else 1 if num_comments > 10 else 0
+        return min(bound, 10)
+    
+    def _full_cost(self, story: Dict) -> int:
+        """Requests process_stories would spend on this story's comments"""
+        _, num_comments = self._fields(story)
+        if num_comments <= 0:
+            return 0
+        return ('kids' not in story) + min(num_comments, self.comment_items)
+    
+    def show_hn(self, stories: List[Dict], fetcher: HNFetcher) -> List[Dict]:
+        """Show HN posts that can pass ``score >= min_score or depth >= min_depth``"""
+        keep = {}
+        undecided = []
+        for story in stories:
+            self.stats['considered'] += 1
+            score, num_comments = self._fields(story)
+            if story.get('type') != 'story' or (score < 5 and num_comments < 3):
+                self.stats['pruned'] += 1  # process_story rejects these; no fetch either way
+                continue
+            if score >= self.min_score:
+                keep[id(story)] = True
+            elif self.depth_upper_bound(story) < self.min_technical_depth:
+                self.stats['pruned'] += 1
+                self.stats['requests_saved'] += self._full_cost(story)
+            elif 'kids' in story and len(story['kids']) >= self.PROBE_COMMENTS \
+                    and self._full_cost(story) > 2 * self.PROBE_COMMENTS:
+                undecided.append(story)  # a probe is cheap next to the full tree
+            else:
+                keep[id(story)] = True
+        
+        requests_before = fetcher.requests
+        probes = fetcher.get_comment_trees(undecided, max_depth=1,
+                                           max_items=self.PROBE_COMMENTS)
+        probe_requests = fetcher.requests - requests_before
+        self.stats['probed'] += len(undecided)
+        self.stats['probe_requests'] += probe_requests
+        self.stats['requests_saved'] -= probe_requests
+        for story in undecided:
+            probe = probes[story.get('id')]
+            # fewer valid comments than probed: comments[:5] would reach deeper
+            if len(probe) < self.PROBE_COMMENTS or \
+                    self.depth_upper_bound(story, probe) >= self.min_technical_depth:
+                keep[id(story)] = True
+            else:
+                self.stats['pruned'] += 1
+                self.stats['requests_saved'] += self._full_cost(story)
+        return [story for story in stories if id(story) in keep]
+    
+    def keyword_hit(self, story: Dict) -> bool:
+        """Whether a keyword hit (analysed without comments) can still pass"""
+        self.stats['considered'] += 1
+        score, _ = self._fields(story)
+        if story.get('type') == 'story' and score >= self.KEYWORD_MIN_SCORE:
+            return True
+        self.stats['pruned'] += 1
+        return False
+    
+    def record_analysis(self, n: int, seconds: float):
+        self.stats['analysed'] += n
+        self.stats['analysis_s'] += seconds
+    
+    def report(self) -> str:
+        st = self.stats
+        per_story = st['analysis_s'] / st['analysed'] if st['analysed'] else 0.0
+        return (f"Query plan: {st['pruned']}/{st['considered']} stories pruned before enrichment "
+                f"({st['probed']} probed, {st['probe_requests']} probe requests), "
+                f"~{st['requests_saved']} requests (net) and "
+                f"~{st['pruned'] * per_story:.3f}s CPU saved")
+
 
 class HNSignalDetector:
     """Main orchestrator for HN signal detection"""
     
-    def __init__(self):
-        self.fetcher = HNFetcher()
+    def __init__(self, max_workers: Optional[int] = None, use_cache: bool = True,
+                 fetcher: Optional[HNFetcher] = None):
+        self.fetcher = fetcher or HNFetcher(max_workers=max_workers, use_cache=use_cache)
         self.analyzer = HNAnalyzer()
+        self.last_plan: Optional[SignalQueryPlan] = None  # stats of the last get_daily_signals
     
-    def process_story(self, story_data: Dict, fetch_comments: bool = True) -> Optional[HNSignal]:
-        """Process a single HN story into a signal"""
+    def process_story(self, story_data: Dict, fetch_comments: bool = True,
+                      comments: Optional[List[Dict]] = None,
+                      analysis: Optional[Dict] = None) -> Optional[HNSignal]:
+        """Process a single HN story into a signal
+        
+        Pass ``comments`` when they were already fetched, and ``analysis``
+        when the story was already scored by HNAnalyzer.analyze_story or
+        analyze_batch (see process_stories).
+        """
         
         # Basic filtering
         if story_data.get('type') != 'story':
@@ -302,24 +749,19 @@ class HNSignalDetector:
         text = story_data.get('text') or story_data.get('story_text')
         url = story_data.get('url')
         
-        comments = []
-        if fetch_comments and num_comments > 0:
-            comments = self.fetcher.get_item_comments(story_id)
+        if comments is None:
+            comments = []
+            if fetch_comments and num_comments > 0:
+                # Algolia hits carry no kids; load the Firebase item once for them
+                item = story_data if 'kids' in story_data else self.fetcher._get_story_safe(story_id)
+                comments = self.fetcher.get_comment_tree(dict(item or {}, id=story_id))
         
         # Analyze
-        builder_present = self.analyzer.detect_builder_presence(title, text, comments, author)
-        technical_depth = self.analyzer.calculate_technical_depth(title, text, comments)
-        links = self.analyzer.extract_links(title, text, url)
+        if analysis is None:
+            analysis = self.analyzer.analyze_story(story_data, comments)
+        links = analysis['links']
         inferred_problem = self.analyzer.infer_problem(title, text)
         
-        # Determine signal type
-        signal_type = "discussion"
-        if 'show hn' in title.lower():
-            signal_type = "show_hn"
-        
-        if builder_present and (links['github'] or links['demo']):
-            signal_type = "launch"
-        
         # Create timestamp - handle both formats
         timestamp = story_data.get('time') or story_data.get('created_at_i', 0)
         created_at = datetime.fromtimestamp(timestamp)
@@ -333,9 +775,9 @@ class HNSignalDetector:
             score=score,
             num_comments=num_comments,
             inferred_problem=inferred_problem,
-            builder_present=builder_present,
-            technical_depth_score=technical_depth,
-            signal_type=signal_type,
+            builder_present=analysis['builder_present'],
+            technical_depth_score=analysis['technical_depth_score'],
+            signal_type=analysis['signal_type'],
             github_links=links['github'],
             demo_links=links['demo'],
             docs_links=links['docs'],
@@ -343,31 +785,92 @@ class HNSignalDetector:
             comment_sample=comments[:5]
         )
     
+    @staticmethod
+    def _passes_filters(story_data: Dict) -> bool:
+        """Mirror of the cheap filters in process_story"""
+        if story_data.get('type') != 'story':
+            return False
+        score = story_data.get('score') or story_data.get('points', 0)
+        kids = story_data.get('kids', [])
+        num_comments = story_data.get('descendants') or story_data.get('num_comments') or len(kids)
+        return not (score < 5 and num_comments < 3)
+    
+    @staticmethod
+    def _needs_comments(story_data: Dict) -> bool:
+        if not HNSignalDetector._passes_filters(story_data):
+            return False
+        kids = story_data.get('kids', [])
+        return (story_data.get('descendants') or story_data.get('num_comments') or len(kids)) > 0
+    
+    def process_stories(self, stories: List[Dict], fetch_comments: bool = True) -> List[Optional[HNSignal]]:
+        """Process many stories, fetching all of their comments in one concurrent batch"""
+        comments_by_id = {}
+        if fetch_comments:
+            # Only spend requests on stories process_story will not discard
+            wanted = [s for s in stories if self._needs_comments(s)]
+            comments_by_id = self.fetcher.get_comments_for_items(wanted)
+        
+        comments = [comments_by_id.get(story.get('id') or story.get('objectID'), [])
+                    for story in stories]
+        # Score every story that survives the cheap filters in one batch
+        kept = [i for i, story in enumerate(stories) if self._passes_filters(story)]
+        analyses = dict(zip(kept, self.analyzer.analyze_batch(
+            [dict(stories[i], comments=comments[i]) for i in kept])))
+        
+        return [
+            self.process_story(story, fetch_comments=False, comments=comments[i],
+                               analysis=analyses.get(i))
+            for i, story in enumerate(stories)
+        ]
+    
     def get_daily_signals(self, min_score: int = 10, min_technical_depth: int = 3) -> List[HNSignal]:
         """Get high-quality signals from the last 24 hours"""
         signals = []
         
+        # One fetch of the top stories feeds every scan below
+        try:
+            pool = self.fetcher.get_candidate_pool()
+        except Exception as e:
+            print(f"Error fetching top stories: {e}")
+            pool = []
+        
+        # Cheap predicates decide which stories are worth enriching
+        plan = SignalQueryPlan(self.analyzer, min_score, min_technical_depth)
+        
         # Get Show HN posts
         print("Fetching Show HN posts...")
-        show_hn_stories = self.fetcher.get_show_hn_stories(days_back=1)
+        show_hn_stories = plan.show_hn(self.fetcher.get_show_hn_stories(days_back=1, pool=pool),
+                                        self.fetcher)
         
-        for story in show_hn_stories:
-            signal = self.process_story(story)
+        started = time.process_time()
+        for signal in self.process_stories(show_hn_stories):
             if signal and (signal.score >= min_score or signal.technical_depth_score >= min_technical_depth):
                 signals.append(signal)
+        plan.record_analysis(len(show_hn_stories), time.process_time() - started)
+        seen_ids = {s.hn_id for s in signals}
         
         # Get top stories with technical keywords
         print("Fetching technical discussions...")
         keywords = ['llm', 'ai', 'infrastructure', 'database', 'api', 'open source']
+        keyword_hits = self.fetcher.scan_keywords(keywords, days_back=1, pool=pool)
+        checked_ids = set()
         for keyword in keywords:
-            stories = self.fetcher.search_by_keyword(keyword, days_back=1)
-            for story in stories[:10]:  # Limit per keyword
+            for story in keyword_hits[keyword][:10]:  # Limit per keyword
+                story_id = story.get('id') or story.get('objectID')
+                if story_id in seen_ids or story_id in checked_ids:
+                    continue
+                checked_ids.add(story_id)
+                if not plan.keyword_hit(story):
+                    continue
+                started = time.process_time()
                 signal = self.process_story(story, fetch_comments=False)
-                if signal and signal.score >= 20 and signal.technical_depth_score >= min_technical_depth:
-                    # Check if we already have this
-                    if not any(s.hn_id == signal.hn_id for s in signals):
-                        signals.append(signal)
+                plan.record_analysis(1, time.process_time() - started)
+                if signal and signal.score >= plan.KEYWORD_MIN_SCORE and signal.technical_depth_score >= min_technical_depth:
+                    seen_ids.add(signal.hn_id)
+                    signals.append(signal)
         
+        self.last_plan = plan
+        print(plan.report())
         return signals
     
     def generate_briefing(self, signals: List[HNSignal]) -> str:
@@ -414,6 +917,201 @@ class HNSignalDetector:
         return briefing
 
 
+class SeenSet:
+    """Compact set of HN item ids: one bit per id from ``base`` upwards
+    
+    Ids below ``base`` count as already seen, so a follower started at the
+    current maxitem never revisits history. A million ids take 125 KB.
+    """
+    
+    def __init__(self, base: int = 0):
+        self.base = base
+        self._bits = bytearray()
+        self._count = 0
+    
+    def __contains__(self, item_id: int) -> bool:
+        offset = item_id - self.base
+        if offset < 0:
+            return True
+        byte = offset >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << (offset & 7)))
+    
+    def add(self, item_id: int) -> bool:
+        """Mark an id as seen; returns False if it already was"""
+        if item_id in self:
+            return False
+        offset = item_id - self.base
+        byte = offset >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(max(byte + 1 - len(self._bits), len(self._bits) // 2)))
+        self._bits[byte] |= 1 << (offset & 7)
+        self._count += 1
+        return True
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class HNTailFollower:
+    """Follow HN as items are created, instead of re-polling topstories
+    
+    Each poll reads ``/maxitem`` and fetches every id created since the last
+    poll, concurrently. New stories are tracked for TRACK_WINDOW seconds;
+    when ``/updates`` lists one of them or one of its comments, or a new
+    comment lands anywhere in its thread, it is re-fetched and run through ``HNSignalDetector.process_story``
+    again. Fresh stories rarely pass the engagement filter, so most signals
+    come from these re-checks. Each story is emitted once, the first time
+    it qualifies — or, with ``rescore``, again whenever it changes while
+    tracked, so callers can follow its points and comments. Items and
+    re-checks that fail upstream are retried on the next poll.
+    """
+    
+    POLL_INTERVAL = 30  # seconds between polls
+    MAX_NEW_PER_POLL = 2000  # cap on the maxitem catch-up per poll
+    TRACK_WINDOW = 24 * 3600  # how long a story is watched for engagement
+    MAX_ITEM_RETRIES = 3  # ids past maxitem can 404 briefly; retry this often
+    
+    def __init__(self, detector: Optional[HNSignalDetector] = None,
+                 poll_interval: Optional[float] = None, backlog: int = 0,
+                 min_score: int = 10, min_technical_depth: int = 3, rescore: bool = False):
+        self.detector = detector or HNSignalDetector()
+        self.rescore = rescore
+        self.fetcher = self.detector.fetcher
+        self.poll_interval = self.POLL_INTERVAL if poll_interval is None else poll_interval
+        self.backlog = backlog
+        self.min_score = min_score
+        self.min_technical_depth = min_technical_depth
+        self.last_max: Optional[int] = None
+        self.seen: Optional[SeenSet] = None  # ids fetched as new items
+        self.emitted: Optional[SeenSet] = None  # story ids already signalled
+        self.tracked: Dict[int, float] = {}  # story id → first seen (unix time)
+        self.roots: Dict[int, int] = {}  # comment id → tracked story it belongs to
+        self._retry: Dict[int, int] = {}  # ids that came back empty → attempts
+        self._recheck: set = set()  # tracked stories whose re-fetch failed
+        self.newest_item_time: Optional[int] = None  # creation time of the newest item fetched
+        self.stats: Dict[str, int] = {
+            'polls': 0, 'items_fetched': 0, 'items_skipped': 0, 'stories_seen': 0,
+            'stories_rechecked': 0, 'signals': 0, 'rescored': 0, 'requests': 0,
+        }
+    
+    def _qualifies(self, signal: Optional[HNSignal]) -> bool:
+        return bool(signal) and (signal.score >= self.min_score
+                                 or signal.technical_depth_score >= self.min_technical_depth)
+    
+    def _new_ids(self, max_item: int) -> List[int]:
+        if self.last_max is None:
+            self.last_max = max_item - self.backlog
+            self.seen = SeenSet(self.last_max + 1)
+            self.emitted = SeenSet(self.last_max + 1)
+        start = max(self.last_max + 1, max_item - self.MAX_NEW_PER_POLL + 1)
+        self.stats['items_skipped'] += max(0, start - self.last_max - 1)
+        new_ids = [i for i in range(start, max_item + 1) if i not in self.seen]
+        self.last_max = max(self.last_max, max_item)
+        return list(self._retry) + new_ids
+    
+    def _expire(self, now: float):
+        cutoff = now - self.TRACK_WINDOW
+        for story_id in [i for i, t in self.tracked.items() if t < cutoff]:
+            del self.tracked[story_id]
+        self.roots = {c: s for c, s in self.roots.items() if s in self.tracked}
+    
+    def _root(self, item_id: int) -> Optional[int]:
+        """Tracked story an item id is, or belongs to (None if neither)"""
+        if item_id in self.tracked:
+            return item_id
+        return self.roots.get(item_id)
+    
+    def poll(self) -> List[HNSignal]:
+        """One step: fetch new items and re-check changed stories"""
+        # every request counts: maxitem, updates, new items, re-checks, comment trees
+        requests_before = self.fetcher.requests
+        try:
+            return self._poll()
+        finally:
+            self.stats['requests'] += self.fetcher.requests - requests_before
+    
+    def _poll(self) -> List[HNSignal]:
+        now = time.time()
+        self.stats['polls'] += 1
+        max_item = self.fetcher.get_max_item()
+        updates = self.fetcher.get_updates()
+        
+        new_ids = self._new_ids(max_item)
+        dirty = ({self._root(i) for i in updates.get('items', [])} | self._recheck) - {None}
+        
+        failed: List[int] = []
+        items = self.fetcher.get_stories(new_ids, errors=failed)
+        failed = set(failed)
+        fresh_stories = []
+        for item_id, item in zip(new_ids, items):
+            if item_id in failed or (item and 'type' not in item):
+                # upstream error, not a missing item: try again next poll
+                self._retry.setdefault(item_id, 0)
+                continue
+            if not item:
+                attempts = self._retry.get(item_id, 0) + 1
+                if attempts < self.MAX_ITEM_RETRIES:
+                    self._retry[item_id] = attempts
+                else:
+                    self._retry.pop(item_id, None)
+                continue
+            self._retry.pop(item_id, None)
+            self.seen.add(item_id)
+            self.newest_item_time = max(self.newest_item_time or 0, item.get('time', 0))
+            if item.get('deleted') or item.get('dead'):
+                continue
+            if item.get('type') == 'story':
+                self.stats['stories_seen'] += 1
+                self.tracked[item_id] = item.get('time', now)
+                fresh_stories.append(item)
+            else:
+                # a reply at any depth under a story we watch (ids ascend, so a
+                # parent fetched in this poll is already resolved)
+                root = self._root(item.get('parent'))
+                if root is not None:
+                    self.roots[item_id] = root
+                    dirty.add(root)
+        self.stats['items_fetched'] += len(new_ids)
+        
+        dirty -= {s['id'] for s in fresh_stories}
+        dirty = [i for i in dirty if self.rescore or i not in self.emitted]
+        failed = []
+        rechecked = [s for s in self.fetcher.get_stories(dirty, fresh=True, errors=failed)
+                     if s and 'type' in s]
+        self._recheck = {i for i in failed if i in self.tracked}
+        self.stats['stories_rechecked'] += len(dirty)
+        
+        signals = []
+        for story in fresh_stories + rechecked:
+            signal = self.detector.process_story(story)
+            if not self._qualifies(signal):
+                continue
+            if self.emitted.add(story['id']):
+                self.stats['signals'] += 1
+                signals.append(signal)
+            elif self.rescore:
+                self.stats['rescored'] += 1
+                signals.append(signal)
+        self._expire(now)
+        return signals
+    
+    def follow(self, max_polls: Optional[int] = None):
+        """Yield signals as they qualify, polling every poll_interval seconds"""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            started = time.monotonic()
+            try:
+                yield from self.poll()
+            except Exception as e:
+                print(f"Tail poll failed: {e}")
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(max(0.0, self.poll_interval - (time.monotonic() - started)))
+
+
 if __name__ == "__main__":
     detector = HNSignalDetector()
     
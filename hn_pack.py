@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Packed HN snapshot format (.hnpk)
+=================================
+Compressed, randomly accessible alternative to the pretty-printed JSON
+snapshots written by HNCollector.run. Reading one signal no longer means
+parsing a multi-megabyte file.
+
+File layout:
+  b'HNPK' + version byte
+  block*          gzip members, each holding BLOCK_RECORDS signals as JSON lines
+  footer          gzip'd JSON: meta, per-block offsets + zone maps, hn_id index
+  trailer         footer offset (8 bytes LE), footer length (8 bytes LE), b'HNPK'
+
+The reader memory-maps the file. Point lookups decompress one block; filtered
+scans skip every block whose zone map (time range, max points, types) rules
+it out.
+
+Usage:
+  python3 hn_pack.py convert hn_signals/raw/hn_signals_*.json
+  python3 hn_pack.py get hn_signals/raw/hn_signals_latest.hnpk 47061013
+  python3 hn_pack.py scan hn_signals/raw/hn_signals_latest.hnpk --type show_hn --min-points 50
+"""
+
+import argparse
+import gzip
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections import OrderedDict
+
+MAGIC = b'HNPK'
+VERSION = 1
+BLOCK_RECORDS = 64
+BLOCK_CACHE = 8          # decompressed blocks kept per reader
+TRAILER = struct.Struct('<QQ4s')
+
+
+class PackWriter:
+    """Streams signals into a .hnpk file; call close(meta) to finish it."""
+
+    def __init__(self, path, block_records=BLOCK_RECORDS):
+        self.path = path
+        self.block_records = block_records
+        self._tmp = f"{path}.tmp"
+        self._f = open(self._tmp, 'wb')
+        self._f.write(MAGIC + bytes([VERSION]))
+        self._pending = []
+        self._blocks = []
+        self._index = {}
+        self.count = 0
+
+    def write(self, signal):
+        self._index[str(signal.get('hn_id'))] = [len(self._blocks), len(self._pending)]
+        self._pending.append(signal)
+        self.count += 1
+        if len(self._pending) >= self.block_records:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        lines = ''.join(json.dumps(s, ensure_ascii=False, separators=(',', ':')) + '\n'
+                        for s in self._pending)
+        data = gzip.compress(lines.encode('utf-8'), compresslevel=6, mtime=0)
+        ts = [s.get('created_at_ts', 0) for s in self._pending]
+        self._blocks.append({
+            'offset': self._f.tell(),
+            'length': len(data),
+            'count': len(self._pending),
+            'min_ts': min(ts),
+            'max_ts': max(ts),
+            'max_points': max(s.get('points', 0) for s in self._pending),
+            'types': sorted({s.get('type') for s in self._pending}),
+        })
+        self._f.write(data)
+        self._pending = []
+
+    def close(self, meta=None):
+        self._flush()
+        footer = gzip.compress(json.dumps({
+            'meta': meta or {},
+            'count': self.count,
+            'blocks': self._blocks,
+            'index': self._index,
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), mtime=0)
+        offset = self._f.tell()
+        self._f.write(footer)
+        self._f.write(TRAILER.pack(offset, len(footer), MAGIC))
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+
+class PackReader:
+    """Memory-mapped, block-cached reader for .hnpk files."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:4] != MAGIC:
+            raise ValueError(f"{path} is not an .hnpk file")
+        offset, length, magic = TRAILER.unpack(self._mm[-TRAILER.size:])
+        if magic != MAGIC:
+            raise ValueError(f"{path} is truncated")
+        footer = json.loads(gzip.decompress(self._mm[offset:offset + length]))
+        self.meta = footer['meta']
+        self.blocks = footer['blocks']
+        self.index = footer['index']
+        self._cache = OrderedDict()
+        self.blocks_read = 0
+
+    def __len__(self):
+        return sum(b['count'] for b in self.blocks)
+
+    def _block(self, n):
+        if n in self._cache:
+            self._cache.move_to_end(n)
+            return self._cache[n]
+        b = self.blocks[n]
+        raw = zlib.decompress(self._mm[b['offset']:b['offset'] + b['length']], 16 + zlib.MAX_WBITS)
+        # split on '\n' only: splitlines() would also break at U+2028/U+2029/\x85,
+        # which ensure_ascii=False leaves raw inside JSON strings
+        lines = raw.decode('utf-8').split('\n')[:-1]
+        self.blocks_read += 1
+        self._cache[n] = lines
+        if len(self._cache) > BLOCK_CACHE:
+            self._cache.popitem(last=False)
+        return lines
+
+    def get(self, hn_id):
+        loc = self.index.get(str(hn_id))
+        if loc is None:
+            return None
+        return json.loads(self._block(loc[0])[loc[1]])
+
+    def scan(self, since_ts=None, until_ts=None, min_points=None, type=None, predicate=None):
+        """Yield signals in file order, decompressing only blocks that can match."""
+        for n, b in enumerate(self.blocks):
+            if since_ts is not None and b['max_ts'] <= since_ts:
+                continue
+            if until_ts is not None and b['min_ts'] > until_ts:
+                continue
+            if min_points is not None and b['max_points'] < min_points:
+                continue
+            if type is not None and type not in b['types']:
+                continue
+            for line in self._block(n):
+                sig = json.loads(line)
+                if since_ts is not None and sig.get('created_at_ts', 0) <= since_ts:
+                    continue
+                if until_ts is not None and sig.get('created_at_ts', 0) > until_ts:
+                    continue
+                if min_points is not None and sig.get('points', 0) < min_points:
+                    continue
+                if type is not None and sig.get('type') != type:
+                    continue
+                if predicate is None or predicate(sig):
+                    yield sig
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_snapshot(path, output):
+    """Write a collector output dict ({'meta', 'signals'}) as .hnpk."""
+    writer = PackWriter(path)
+    for sig in output['signals']:
+        writer.write(sig)
+    writer.close(output.get('meta'))
+
+
+def read_snapshot(path):
+    """Load a whole .hnpk back into the collector's {'meta', 'signals'} shape."""
+    with PackReader(path) as reader:
+        return {'meta': reader.meta, 'signals': list(reader.scan())}
+
+
+def convert(json_path, pack_path=None):
+    pack_path = pack_path or os.path.splitext(json_path)[0] + '.hnpk'
+    with open(json_path, encoding='utf-8') as f:
+        write_snapshot(pack_path, json.load(f))
+    return pack_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Packed HN snapshot tools.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    conv = sub.add_parser('convert', help="JSON snapshot(s) → .hnpk alongside")
+    conv.add_argument('paths', nargs='+')
+    get = sub.add_parser('get', help="print one signal")
+    get.add_argument('path')
+    get.add_argument('hn_id')
+    scan = sub.add_parser('scan', help="print matching signal titles")
+    scan.add_argument('path')
+    scan.add_argument('--type')
+    scan.add_argument('--min-points', type=int)
+    scan.add_argument('--since-ts', type=int)
+    scan.add_argument('--until-ts', type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        for path in args.paths:
+            out = convert(path)
+            print(f"  {path} ({os.path.getsize(path):,} B) → {out} ({os.path.getsize(out):,} B)")
+    elif args.command == 'get':
+        with PackReader(args.path) as reader:
+            sig = reader.get(args.hn_id)
+            if sig is None:
+                print(f"hn_id {args.hn_id} not in {args.path}", file=sys.stderr)
+                return 1
+            json.dump(sig, sys.stdout, indent=2, ensure_ascii=False)
+            print()
+    else:
+        with PackReader(args.path) as reader:
+            n = 0
+            for sig in reader.scan(args.since_ts, args.until_ts, args.min_points, args.type):
+                print(f"{sig['points']:>5}  {sig['title']}")
+                n += 1
+            print(f"{n} signals, {reader.blocks_read}/{len(reader.blocks)} blocks read",
+                  file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Adaptive rate limiting for the HN APIs
+======================================
+Shared by every request path in HNCollector so the whole process runs at
+the highest rate the API tolerates, and no faster.
+
+  - AdaptiveRateLimiter: token bucket whose refill rate grows while the API
+    answers quickly and shrinks on slow responses, 429s and 5xx errors.
+    A second, hour-long bucket enforces Algolia's 10k requests/hour cap.
+  - CircuitBreaker: stops calling an API that keeps failing, then probes it
+    again after a cooldown.
+  - backoff_delay: jittered exponential delay between retries.
+
+All classes are thread-safe.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# ── Defaults ───────────────────────────────────────────────────────────────
+
+INITIAL_RATE = 3.0        # requests/second at start (≈ old 0.3 s fixed delay)
+MIN_RATE = 0.5            # never slow down below this
+MAX_RATE = 10.0           # never speed up beyond this
+BURST = 10                # short-term bucket capacity
+HOURLY_BUDGET = 10_000    # Algolia limit per IP per hour
+
+LATENCY_TARGET = 1.0      # seconds; slower responses mean the API is straining
+RATE_INCREASE = 0.25      # additive increase per fast response (req/s)
+RATE_DECREASE = 0.5       # multiplicative decrease on throttling / errors
+LATENCY_DECREASE = 0.75   # gentler decrease when responses get slow
+
+RETRY_BASE_DELAY = 1.0    # seconds
+RETRY_MAX_DELAY = 60.0
+BREAKER_THRESHOLD = 5     # consecutive failures before the circuit opens
+BREAKER_COOLDOWN = 60.0   # seconds before a half-open probe
+
+
+def parse_retry_after(value, now=None):
+    """Return the delay in seconds requested by a Retry-After header, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveRateLimiter:
+    """AIMD token bucket driven by response latency and throttling signals."""
+
+    def __init__(self, rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 burst=BURST, hourly_budget=HOURLY_BUDGET,
+                 latency_target=LATENCY_TARGET):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.latency_target = latency_target
+        self.hourly_budget = hourly_budget
+        self._tokens = float(burst)
+        self._hour_tokens = float(hourly_budget) if hourly_budget else None
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        if self._hour_tokens is not None:
+            self._hour_tokens = min(self.hourly_budget,
+                                    self._hour_tokens + elapsed * self.hourly_budget / 3600)
+
+    def acquire(self, deadline=None):
+        """Block until a request may be sent. Returns the time spent waiting,
+        or None if that would run past `deadline` (a time.monotonic() value)."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1 and (self._hour_tokens is None or self._hour_tokens >= 1):
+                        self._tokens -= 1
+                        if self._hour_tokens is not None:
+                            self._hour_tokens -= 1
+                        return waited
+                    wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0
+                    if self._hour_tokens is not None and self._hour_tokens < 1:
+                        wait = max(wait, (1 - self._hour_tokens) * 3600 / self.hourly_budget)
+            if deadline is not None and now + wait >= deadline:
+                return None
+            time.sleep(wait)
+            waited += wait
+
+    def record_success(self, latency):
+        with self._lock:
+            if latency > self.latency_target:
+                self.rate = max(self.min_rate, self.rate * LATENCY_DECREASE)
+            else:
+                self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+
+    def record_throttle(self, retry_after=None):
+        """Back off after a 429/503; honour Retry-After for every caller."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def record_error(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed → open after `threshold` consecutive failures → half-open after
+    `cooldown` seconds, where a single probe decides whether to close again."""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.state = 'closed'
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == 'open':
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    raise CircuitOpenError(f"circuit open after {self.failures} failures")
+                self.state = 'half_open'
+                self._probing = False
+            if self.state == 'half_open':
+                if self._probing:
+                    raise CircuitOpenError("circuit half-open, probe in flight")
+                self._probing = True
+
+    def cancel_call(self):
+        """A call allowed by before_call was never sent; free the probe slot."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = 'closed'
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == 'half_open' or self.failures >= self.threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+HN Signal Store
+===============
+SQLite home for HNCollector.build_signal output, so filters run as indexed
+queries instead of loading whole snapshot files and scanning every signal.
+
+  - one row per signal; re-ingesting a signal replaces it
+  - secondary indexes on author, type, created_at_ts, points
+  - GitHub repo slugs in their own indexed table
+  - FTS5 full-text index over title, body text and top comments
+
+Usage:
+  python3 hn_store.py ingest hn_signals/raw/hn_signals_*.json
+  python3 hn_store.py query --text "gdpr OR europe" --builder --limit 20
+
+  store = SignalStore()
+  store.query(author='pg', min_points=100)
+  store.query(repo='openfuseio/openfuse-sdk-node')
+  store.query(text='circuit breaker', builder=True, order_by='rank')
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from hn_collector import load_snapshot
+
+DEFAULT_STORE_PATH = os.path.join('hn_signals', 'signals.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    hn_id           INTEGER PRIMARY KEY,
+    type            TEXT,
+    title           TEXT,
+    url             TEXT,
+    author          TEXT,
+    points          INTEGER,
+    num_comments    INTEGER,
+    created_at_ts   INTEGER,
+    author_intent   TEXT,
+    builder_present INTEGER,
+    has_github      INTEGER,
+    has_demo        INTEGER,
+    has_docs        INTEGER,
+    has_monetisation_language INTEGER,
+    data            TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_signals_author  ON signals (author);
+CREATE INDEX IF NOT EXISTS idx_signals_type    ON signals (type);
+CREATE INDEX IF NOT EXISTS idx_signals_created ON signals (created_at_ts);
+CREATE INDEX IF NOT EXISTS idx_signals_points  ON signals (points);
+
+CREATE TABLE IF NOT EXISTS signal_repos (
+    hn_id INTEGER NOT NULL REFERENCES signals (hn_id),
+    slug  TEXT NOT NULL,
+    PRIMARY KEY (slug, hn_id)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS signals_fts
+    USING fts5(title, body_text, comments, tokenize = 'porter unicode61');
+"""
+
+ORDER_BY = {
+    'points': 's.points DESC, s.hn_id DESC',
+    'newest': 's.created_at_ts DESC, s.hn_id DESC',
+    'oldest': 's.created_at_ts ASC, s.hn_id ASC',
+    'rank': 'bm25(signals_fts)',  # only with text=
+}
+
+
+class SignalStore:
+    """Indexed, full-text searchable collection of collector signals."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    # ── Ingest ─────────────────────────────────────────────────────────
+
+    def ingest(self, signals):
+        """Insert or replace signals; returns how many were written."""
+        n = 0
+        with self.db:
+            for sig in signals:
+                hn_id = int(sig['hn_id'])
+                self._delete(hn_id)
+                self.db.execute(
+                    'INSERT INTO signals VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)', (
+                        hn_id, sig.get('type'), sig.get('title'), sig.get('url'),
+                        sig.get('author'), sig.get('points', 0), sig.get('num_comments', 0),
+                        sig.get('created_at_ts', 0), sig.get('author_intent'),
+                        sig.get('builder_present', False), sig.get('has_github', False),
+                        sig.get('has_demo', False), sig.get('has_docs', False),
+                        sig.get('has_monetisation_language', False),
+                        json.dumps(sig, ensure_ascii=False),
+                    ))
+                slugs = {s.lower() for s in sig.get('extracted_links', {}).get('github_repos', [])}
+                self.db.executemany('INSERT INTO signal_repos VALUES (?, ?)',
+                                    [(hn_id, slug) for slug in sorted(slugs)])
+                self.db.execute(
+                    'INSERT INTO signals_fts (rowid, title, body_text, comments) VALUES (?,?,?,?)',
+                    (hn_id, sig.get('title') or '', sig.get('body_text') or '',
+                     '\n'.join(c.get('text', '') for c in sig.get('top_comments', []))))
+                n += 1
+        return n
+
+    def ingest_snapshot(self, path):
+        return self.ingest(load_snapshot(path)['signals'])
+
+    def _delete(self, hn_id):
+        self.db.execute('DELETE FROM signals WHERE hn_id = ?', (hn_id,))
+        self.db.execute('DELETE FROM signal_repos WHERE hn_id = ?', (hn_id,))
+        self.db.execute('DELETE FROM signals_fts WHERE rowid = ?', (hn_id,))
+
+    # ── Queries ────────────────────────────────────────────────────────
+
+    def get(self, hn_id):
+        row = self.db.execute('SELECT data FROM signals WHERE hn_id = ?',
+                              (int(hn_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(self, author=None, type=None, intent=None, builder=None,
+              has_github=None, has_demo=None, has_artifacts=None, monetisation=None,
+              since_ts=None, until_ts=None, min_points=None, min_comments=None,
+              repo=None, text=None, order_by='points', limit=None):
+        """Signals matching every given filter (None means "don't care").
+
+        `repo` is a GitHub "owner/name" slug (case-insensitive), `text` an
+        FTS5 match expression over title, body and comments, and
+        `has_artifacts` means a GitHub repo or a demo link.
+        """
+        where, args = [], []
+        joins = ''
+        if text is not None:
+            joins += ' JOIN signals_fts ON signals_fts.rowid = s.hn_id'
+            where.append('signals_fts MATCH ?')
+            args.append(text)
+        if repo is not None:
+            where.append('s.hn_id IN (SELECT hn_id FROM signal_repos WHERE slug = ?)')
+            args.append(repo.lower())
+        for column, value in (('author', author), ('type', type), ('author_intent', intent)):
+            if value is not None:
+                where.append(f's.{column} = ?')
+                args.append(value)
+        for column, value in (('builder_present', builder), ('has_github', has_github),
+                              ('has_demo', has_demo),
+                              ('has_monetisation_language', monetisation)):
+            if value is not None:
+                where.append(f's.{column} = ?')
+                args.append(int(bool(value)))
+        if has_artifacts is not None:
+            where.append(('' if has_artifacts else 'NOT ') + '(s.has_github OR s.has_demo)')
+        for clause, value in (('s.created_at_ts > ?', since_ts), ('s.created_at_ts <= ?', until_ts),
+                              ('s.points >= ?', min_points), ('s.num_comments >= ?', min_comments)):
+            if value is not None:
+                where.append(clause)
+                args.append(value)
+
+        if order_by == 'rank' and text is None:
+            order_by = 'points'
+        sql = f'SELECT s.data FROM signals s{joins}'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f' ORDER BY {ORDER_BY[order_by]}'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            args.append(limit)
+        return [json.loads(row[0]) for row in self.db.execute(sql, args)]
+
+    def count(self):
+        return self.db.execute('SELECT COUNT(*) FROM signals').fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HN signal store.")
+    parser.add_argument('--db', default=DEFAULT_STORE_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    ing = sub.add_parser('ingest', help="load collector snapshot files")
+    ing.add_argument('paths', nargs='+')
+    q = sub.add_parser('query', help="print matching signals")
+    q.add_argument('--text')
+    q.add_argument('--author')
+    q.add_argument('--type')
+    q.add_argument('--repo')
+    q.add_argument('--builder', action='store_true', default=None)
+    q.add_argument('--min-points', type=int)
+    q.add_argument('--order-by', choices=sorted(ORDER_BY), default='points')
+    q.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    store = SignalStore(args.db)
+    if args.command == 'ingest':
+        for path in args.paths:
+            print(f"  {path}: {store.ingest_snapshot(path)} signals")
+        print(f"  store now holds {store.count()} signals")
+    else:
+        for sig in store.query(author=args.author, type=args.type, repo=args.repo,
+                               builder=args.builder, min_points=args.min_points,
+                               text=args.text, order_by=args.order_by, limit=args.limit):
+            print(f"{sig['points']:>5}  {sig['title']}\n       {sig['hn_url']}")
+    store.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -238,6 +238,70 @@ def example_filtering_pipeline():
     return high_value_signals
 
 
+def example_store_filtering_pipeline(snapshot_path=None):
+    """
+    Example: Same European-formation filter over collector output, run as
+    indexed SignalStore queries instead of a Python scan per filter.
+    EU terms are matched as words in the title and body (not comments);
+    technical depth is scored as in the original, on the query's results.
+    Reads the collector's newest hn_signals_latest file (.json, .jsonl or
+    .hnpk) unless given a snapshot_path.
+    """
+    from hn_collector import latest_snapshot_path
+    from hn_module import HNAnalyzer
+    from hn_store import SignalStore
+    
+    snapshot_path = snapshot_path or latest_snapshot_path('hn_signals')
+    if snapshot_path is None:
+        print("No collector snapshot found under hn_signals/raw/")
+        return []
+    
+    store = SignalStore(':memory:')
+    store.ingest_snapshot(snapshot_path)
+    
+    print("📊 HN Signal Filtering for European Formations (SignalStore)\n")
+    print("=" * 70)
+    
+    # Builder present + artifacts + EU context, in one query
+    eu_terms = [
+        'gdpr', 'eu', 'europe', 'european', 'sepa',
+        '"ai act"', 'dma', 'psd2', 'brexit',
+        'berlin', 'london', 'paris', 'amsterdam'
+    ]
+    matches = store.query(
+        builder=True,
+        has_artifacts=True,
+        text='{title body_text} : (' + ' OR '.join(eu_terms) + ')',
+        order_by='rank',
+    )
+    
+    # Technical depth: collector signals don't carry the score, so compute it
+    analyzer = HNAnalyzer()
+    matches = [s for s in matches
+               if analyzer.calculate_technical_depth(s['title'], s['body_text'],
+                                                     s['top_comments']) >= 3]
+    
+    high_value_signals = [{
+        'title': s['title'],
+        'author': s['author'],
+        'github': s['extracted_links']['github_repos'],
+        'problem': (s['body_text'] or s['title'])[:200],
+        'hn_url': s['hn_url'],
+    } for s in matches]
+    
+    print(f"Found {len(high_value_signals)} EU-relevant formation signals:\n")
+    
+    for i, signal in enumerate(high_value_signals, 1):
+        print(f"{i}. {signal['title']}")
+        print(f"   Author: {signal['author']}")
+        if signal['github']:
+            print(f"   GitHub: {signal['github'][0]}")
+        print(f"   {signal['hn_url']}\n")
+    
+    store.close()
+    return high_value_signals
+
+
 def example_weekly_summary():
     """
     Example: Generate weekly summary of formation signals
@@ -279,7 +343,7 @@ if __name__ == "__main__":
     print("Running orchestration examples...\n")
     
     # Example 1: Filter HN signals for EU
-    example_filtering_pipeline()
+    example_store_filtering_pipeline()
     
     print("\n" + "=" * 70)
     print("\nThis demonstrates:")
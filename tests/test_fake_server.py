@@ -0,0 +1,126 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hn_collector  # noqa: E402
+import hn_daemon  # noqa: E402
+from hn_collector import (COMMENT_FETCH_MIN_COMMENTS, COMMENT_FETCH_MIN_POINTS,  # noqa: E402
+                          MAX_COMMENTS_PER_POST, MIN_COMMENTS_THREAD, MIN_POINTS_SHOW_HN,
+                          MIN_POINTS_THREAD, HNCollector, load_snapshot)
+from hn_fake_server import COMMENT, SHOW_HN, FakeHNServer, SyntheticCorpus  # noqa: E402
+from hn_module import HNFetcher, HNSignalDetector, HNTailFollower  # noqa: E402
+from hn_ratelimit import AdaptiveRateLimiter  # noqa: E402
+
+CORPUS = SyntheticCorpus(n_items=20000, days=10, seed=3)
+LOOKBACK_DAYS = 5
+
+
+def fast_limiter():
+    # the fake server answers in microseconds; don't pace it like the real API
+    return AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=1000, hourly_budget=None)
+
+
+def expected_posts(corpus, cutoff_ts):
+    """Ground truth for the collector's two queries: hn_id → (type, points, num_comments)."""
+    visible = corpus.max_item()
+    posts = {}
+    for item_id in range(1, visible + 1):
+        kind = corpus.kind[item_id]
+        if kind == COMMENT or corpus.times[item_id] <= cutoff_ts:
+            continue
+        points = corpus.points[item_id]
+        comments = corpus.descendants(item_id, visible)
+        if kind == SHOW_HN:
+            if points > MIN_POINTS_SHOW_HN:
+                posts[str(item_id)] = ('show_hn', points, comments)
+        elif points > MIN_POINTS_THREAD and comments > MIN_COMMENTS_THREAD:
+            posts[str(item_id)] = ('technical_thread', points, comments)
+    return posts
+
+
+def run_collector(server, output_dir, **kwargs):
+    collector = HNCollector(lookback_days=LOOKBACK_DAYS, output_dir=output_dir,
+                            use_cache=False, limiter=fast_limiter(),
+                            algolia_base=server.algolia_base, **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        dated, _ = collector.run()
+    return collector, load_snapshot(dated)
+
+
+class CollectorAgainstFakeServerTest(unittest.TestCase):
+
+    def test_results_match_corpus(self):
+        with FakeHNServer(CORPUS) as server, tempfile.TemporaryDirectory() as tmp:
+            collector, snapshot = run_collector(server, tmp)
+
+        expected = expected_posts(CORPUS, collector.cutoff_ts)
+        self.assertTrue(expected)
+        got = {sig['hn_id']: (sig['type'], sig['points'], sig['num_comments'])
+               for sig in snapshot['signals']}
+        self.assertEqual(got, expected)
+        self.assertFalse(snapshot['meta']['partial'])
+
+        for sig in snapshot['signals']:
+            story = int(sig['hn_id'])
+            thread = CORPUS.thread[CORPUS.thread_ptr[story]:CORPUS.thread_ptr[story + 1]]
+            authors = {CORPUS.author_name(c) for c in thread}
+            self.assertLessEqual(len(sig['top_comments']), MAX_COMMENTS_PER_POST)
+            self.assertTrue(all(c['author'] in authors for c in sig['top_comments']))
+            if (sig['points'] >= COMMENT_FETCH_MIN_POINTS
+                    or sig['num_comments'] >= COMMENT_FETCH_MIN_COMMENTS):
+                self.assertTrue(sig['top_comments'], sig['hn_id'])
+
+    def test_injected_errors_mark_snapshot_partial(self):
+        with mock.patch.object(hn_collector, 'backoff_delay', return_value=0), \
+                FakeHNServer(CORPUS, error_rate=1.0) as server, \
+                tempfile.TemporaryDirectory() as tmp:
+            collector, snapshot = run_collector(server, tmp)
+
+        self.assertTrue(snapshot['meta']['partial'])
+        self.assertGreater(collector.failed_requests(), 0)
+        self.assertIsNone(collector._incremental_plan(snapshot))
+
+
+class DaemonAgainstFakeServerTest(unittest.TestCase):
+
+    def make_daemon(self, server):
+        fetcher = HNFetcher(use_cache=False, firebase_base=server.firebase_base)
+        follower = HNTailFollower(HNSignalDetector(fetcher=fetcher), poll_interval=0,
+                                  backlog=200)
+        return hn_daemon.SignalDaemon(follower, [])
+
+    def test_keeps_polling_through_errors(self):
+        with mock.patch.object(hn_daemon, 'backoff_delay', return_value=0), \
+                FakeHNServer(CORPUS, error_rate=1.0) as server:
+            daemon = self.make_daemon(server)
+            with contextlib.redirect_stdout(io.StringIO()):
+                daemon.run(max_polls=4)
+
+        self.assertEqual(daemon.errors, 4)
+        self.assertIn('HTTPError', daemon.last_error)
+        self.assertEqual(daemon.health()['status'], 'starting')
+
+    def test_recovers_after_errors(self):
+        with mock.patch.object(hn_daemon, 'backoff_delay', return_value=0), \
+                FakeHNServer(CORPUS, error_rate=0.3, seed=5) as server:
+            daemon = self.make_daemon(server)
+            with contextlib.redirect_stdout(io.StringIO()):
+                daemon.run(max_polls=10)
+
+        self.assertGreater(daemon.errors, 0)
+        self.assertIsNotNone(daemon.last_success_at)
+        # every backlog item is eventually fetched, none lost to an error body
+        follower = daemon.follower
+        missing = [i for i in range(follower.last_max - 199, follower.last_max + 1)
+                   if i not in follower.seen and i not in follower._retry]
+        self.assertEqual(missing, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hn_pack import PackReader, PackWriter, read_snapshot  # noqa: E402
+
+
+def signal(hn_id, title):
+    return {'hn_id': str(hn_id), 'type': 'show_hn', 'title': title, 'points': hn_id,
+            'created_at_ts': 1700000000 + hn_id, 'top_comments': []}
+
+
+class PackRoundTripTest(unittest.TestCase):
+
+    def test_line_separator_characters_survive(self):
+        titles = ['Show HN: line\u2028separator', 'paragraph\u2029separator',
+                  'next\x85line', 'form\x0cfeed', 'plain']
+        signals = [signal(i, t) for i, t in enumerate(titles, 1)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'snap.hnpk')
+            writer = PackWriter(path, block_records=2)
+            for sig in signals:
+                writer.write(sig)
+            writer.close({'total_signals': len(signals)})
+
+            self.assertEqual(read_snapshot(path)['signals'], signals)
+            with PackReader(path) as reader:
+                for sig in signals:
+                    self.assertEqual(reader.get(sig['hn_id']), sig)
+
+
+if __name__ == '__main__':
+    unittest.main()